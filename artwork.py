@@ -0,0 +1,153 @@
+################################################################################
+# Filename: artwork.py                                                         #
+# Created by: Venceslas Duet                                                   #
+# Created at: 10-19-2026                                                       #
+# Last update at: 10-19-2026                                                   #
+# Description: Cover art decoding and downscaling in worker processes          #
+# Licence: None                                                                #
+################################################################################
+
+import heapq
+import multiprocessing
+import os
+import queue
+from multiprocessing import shared_memory
+
+import pygame
+
+
+def fit_size(size, bounds):
+    ratio = min(bounds[0] / size[0], bounds[1] / size[1])
+    return max(1, round(size[0] * ratio)), max(1, round(size[1] * ratio))
+
+
+def scale_artwork(memory_name, slot_size, jobs, results):
+    memory = shared_memory.SharedMemory(memory_name)
+    try:
+        while True:
+            job = jobs.get()
+            if job is None:
+                break
+            slot, job_id, path, bounds = job
+            try:
+                image = pygame.image.load(path)
+                # smoothscale needs 24 or 32 bits pixels, palettized images are expanded first
+                if image.get_bitsize() not in (24, 32):
+                    expanded = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+                    expanded.blit(image, (0, 0))
+                    image = expanded
+                size = fit_size(image.get_size(), bounds)
+                data = pygame.image.tobytes(pygame.transform.smoothscale(image, size), "RGBA")
+                memory.buf[slot * slot_size:slot * slot_size + len(data)] = data
+            except (pygame.error, OSError, ValueError):
+                size = None
+            results.put((slot, job_id, size))
+    finally:
+        memory.close()
+
+
+class ArtworkLoader:
+    """!@brief Decodes and downscales artwork in a pool of worker processes
+
+    Workers write the scaled pixels into a shared memory ring owned by the loader, only the slot
+    number goes through the queues. Requests wait in a priority queue until a slot is free, so
+    memory stays bounded whatever the size of the library; cancelled requests are removed from it,
+    or have their result discarded when already being decoded.
+
+    @param bounds Largest artwork size (width, height), images are scaled to fit in it
+    @param workers Number of worker processes, one per core by default
+    @param slots Number of images decoded or waiting to be collected at the same time
+    """
+
+    def __init__(self, bounds, workers=None, slots=None):
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if slots is None:
+            slots = 2 * workers
+        if workers <= 0 or slots <= 0:
+            raise ValueError("workers and slots need to be upper to 0")
+        self.bounds = bounds
+        self.slot_size = bounds[0] * bounds[1] * 4
+        self.memory = shared_memory.SharedMemory(create=True, size=self.slot_size * slots)
+        self.free = list(range(slots))
+        context = multiprocessing.get_context("spawn")
+        self.jobs = context.Queue()
+        self.results = context.Queue()
+        self.workers = [context.Process(target=scale_artwork, daemon=True,
+                                        args=(self.memory.name, self.slot_size, self.jobs, self.results))
+                        for i in range(workers)]
+        for i in self.workers:
+            i.start()
+
+        self.sequence = 0
+        # Requests not sent yet: key -> (job id, path, bounds), ordered by a heap of (priority, job id, key)
+        self.pending = {}
+        self.order = []
+        # Requests being decoded: job id -> key (None when cancelled)
+        self.running = {}
+        self.keys = {}
+
+    def request(self, key, path, bounds=None, priority=0):
+        """!@brief Asks for the artwork of key, lower priorities are decoded first"""
+        self.cancel(key)
+        bounds = self.bounds if bounds is None else (min(bounds[0], self.bounds[0]), min(bounds[1], self.bounds[1]))
+        self.sequence += 1
+        self.pending[key] = (self.sequence, path, bounds)
+        heapq.heappush(self.order, (priority, self.sequence, key))
+        self.dispatch()
+
+    def cancel(self, key):
+        if key in self.pending:
+            del self.pending[key]
+        elif key in self.keys:
+            self.running[self.keys.pop(key)] = None
+
+    def is_requested(self, key):
+        return key in self.pending or key in self.keys
+
+    def dispatch(self):
+        while self.free and self.order:
+            priority, job_id, key = heapq.heappop(self.order)
+            entry = self.pending.get(key)
+            if entry is None or entry[0] != job_id:
+                # Cancelled or requested again since
+                continue
+            del self.pending[key]
+            self.running[job_id] = key
+            self.keys[key] = job_id
+            self.jobs.put((self.free.pop(), job_id, entry[1], entry[2]))
+
+    def poll(self):
+        """!@brief Collects the finished artwork without waiting
+
+        @return List of (key, surface), surface is None when the image could not be decoded
+        """
+        ready = []
+        while True:
+            try:
+                slot, job_id, size = self.results.get_nowait()
+            except queue.Empty:
+                break
+            key = self.running.pop(job_id)
+            if key is not None:
+                del self.keys[key]
+                surface = None
+                if size is not None:
+                    start = slot * self.slot_size
+                    view = self.memory.buf[start:start + size[0] * size[1] * 4]
+                    surface = pygame.image.frombuffer(view, size, "RGBA").copy()
+                    del view
+                ready.append((key, surface))
+            self.free.append(slot)
+        self.dispatch()
+        return ready
+
+    def close(self):
+        for i in self.workers:
+            self.jobs.put(None)
+        for i in self.workers:
+            i.join()
+        self.jobs.close()
+        self.results.close()
+        self.memory.close()
+        self.memory.unlink()
@@ -0,0 +1,99 @@
+################################################################################
+# Filename: benchmark.py                                                       #
+# Created by: Venceslas Duet                                                   #
+# Created at: 10-19-2026                                                       #
+# Last update at: 10-19-2026                                                   #
+# Description: Per-call cost of the graphics hot paths with and without        #
+# argument validation                                                          #
+# Licence: None                                                                #
+################################################################################
+
+import argparse
+import statistics
+import time
+
+import pygame
+
+import internal
+from graphics import layer, frame, text
+
+
+def cases(members):
+    """!@brief Validated calls to time, as {name: (function, calls per run)}
+
+    The Layer calls only update member state, so their argument checks are a large part of each
+    call. Frame.resize (alternating between two widths) and Text.gen_letter allocate a surface on
+    every call: their saving is the checks over the rendering they guard.
+    """
+    canvas = layer.Layer((640, 480), 5)
+    surface = pygame.Surface((16, 16), pygame.SRCALPHA)
+    ids = [canvas.add_surface(surface, (i % 640, i % 480), i % 5) for i in range(members)]
+    card = frame.Frame(pygame.Surface((8, 8), pygame.SRCALPHA), (2, 2, 2, 2))
+    font = text.Text(pygame.Surface((16, 16), pygame.SRCALPHA), (1, 1))
+    clip = (layer.ClipPosition.LEFT, layer.ClipPosition.TOP)
+
+    def layer_moves():
+        for j in ids:
+            canvas.absolute_move(j, (j, j))
+            canvas.relative_move(j, (1, 1))
+            canvas.change_surface(j, surface)
+
+    def member_init():
+        for j in range(members):
+            layer.LayerMember(surface, (j, j), 0, clip, 1.0)
+
+    def gen_letter():
+        for i in range(members // 10):
+            font.gen_letter(i % 256)
+
+    def frame_resize():
+        for i in range(members // 10):
+            card.resize((24 + i % 2 * 8, 8))
+
+    return {
+        "Layer moves and changes": (layer_moves, members * 3),
+        "LayerMember.__init__": (member_init, members),
+        "Text.gen_letter": (gen_letter, members // 10),
+        "Frame.resize": (frame_resize, members // 10),
+    }
+
+
+def run(members, repeats):
+    """!@brief Per-call time of each case in both modes
+
+    The modes are interleaved (in alternating order) after a warm-up run, so cache and clock drift
+    affect both alike; each mode keeps the median and the minimum of its repeats.
+
+    @return {name: {mode: (median, minimum)}}, mode being True when validating
+    """
+    timings = {}
+    for name, (function, calls) in cases(members).items():
+        samples = {True: [], False: []}
+        for i in range(repeats):
+            for mode in ((True, False) if i % 2 == 0 else (False, True)):
+                internal.set_validation(mode)
+                function()
+                start = time.perf_counter()
+                function()
+                samples[mode].append((time.perf_counter() - start) / calls)
+        timings[name] = {mode: (statistics.median(values), min(values)) for mode, values in samples.items()}
+    internal.set_validation(__debug__)
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the release mode of the graphics hot paths")
+    parser.add_argument("--members", type=int, default=5000, help="member updates per frame")
+    parser.add_argument("--repeats", type=int, default=15, help="timed runs of each mode")
+    args = parser.parse_args()
+
+    timings = run(args.members, args.repeats)
+
+    print("{:<26}{:>20}{:>22}{:>10}".format("", "debug med/min (ns)", "release med/min (ns)", "saving"))
+    for name, modes in timings.items():
+        debug, release = modes[True], modes[False]
+        print("{:<26}{:>13.0f}/{:<6.0f}{:>15.0f}/{:<6.0f}{:>9.0f}%".format(
+            name, debug[0] * 1e9, debug[1] * 1e9, release[0] * 1e9, release[1] * 1e9,
+            100 * (1 - release[0] / debug[0])))
+    frame_cost = timings["Layer moves and changes"][True][0] - timings["Layer moves and changes"][False][0]
+    print("saving for {} member updates: {:.2f} ms per frame".format(args.members, frame_cost * args.members * 3 * 1000))
@@ -2,11 +2,13 @@
 # Filename: components/__init__.py                                             #
 # Created by: Venceslas Duet                                                   #
 # Created at: 03-14-2022                                                       #
-# Last update at: 03-15-2022                                                   #
+# Last update at: 10-19-2026                                                   #
 # Description: Main package for the launcher components (toolbar, slider,      #
 # clock)                                                                       #
 # Licence: None                                                                #
 ################################################################################
 
 from .clock import *
+from .preview import *
+from .searchbox import *
 from .toolbar import *
@@ -2,7 +2,7 @@
 # Filename: components/clock.py                                                #
 # Created by: Venceslas Duet                                                   #
 # Created at: 03-14-2022                                                       #
-# Last update at: 03-15-2022                                                   #
+# Last update at: 10-19-2026                                                   #
 # Description: Clock component                                                 #
 # Licence: None                                                                #
 ################################################################################
@@ -10,7 +10,7 @@
 import pygame
 from datetime import datetime
 
-from graphics.layer import Layer, ClipPosition
+from graphics.text import CellText
 
 from resource import Resource
 
@@ -60,18 +60,20 @@ class Clock(BaseElement):
     def event_mouse_scroll(self, pos, amount):
         pass
 
-    def __init__(self):
-        self.time = (0, 0)
-        self.background = Resource.getImage(Resource.UI, Resource.UI_CLOCK_BACKGROUND)
-        self.font = Resource.getFont(Resource.FONT_DEFAULT)
+    def __init__(self, show_seconds=False, blink_colon=False, time_source=datetime.now):
+        self.time = (0, 0, 0)
+        self.time_source = time_source
+        self.show_seconds = show_seconds
+        self.blink_colon = blink_colon
+        self.background = None
+        self.font = None
+        self.text = None
         self.lateral_margin = 4
+        self.text_pos = (self.lateral_margin, 2)
+        # Areas of the clock surface redrawn since the last call to pop_damage
+        self.damage = []
 
-        self.layer = Layer((1, 1), 2)
-
-        self.layer.add_surface(self.background, (0, 0), clip=(ClipPosition.CENTER, ClipPosition.TOP))
-        self.clock_id = self.layer.add_surface(pygame.Surface((1, 1)), (0, 2), clip=(ClipPosition.CENTER, ClipPosition.TOP))
-
-        self.refresh()
+        self.hard_refresh()
 
     def is_selectable(self):
         return False
@@ -79,26 +81,59 @@ class Clock(BaseElement):
     def resize(self, size):
         pass
 
+    def set_mode(self, show_seconds, blink_colon):
+        self.show_seconds = show_seconds
+        self.blink_colon = blink_colon
+        self.hard_refresh()
+
     def update_hour(self) -> bool:
-        now = datetime.now()
-        hour, minute = self.time
+        now = self.time_source()
+        second = now.second if self.show_seconds or self.blink_colon else 0
 
-        if now.hour != hour or now.minute != minute:
-            self.time = (now.hour, now.minute)
+        if (now.hour, now.minute, second) != self.time:
+            self.time = (now.hour, now.minute, second)
             return True
         else:
             return False
 
-    def refresh(self):
-        hour, minute = self.time
-        clock = self.font.gen_text("{:02}:{:02}".format(hour, minute))
-        size = (clock.get_width() + 2*self.lateral_margin, self.background.get_height())
+    def next_update_delay(self):
+        now = self.time_source()
+        delay = 1000 - now.microsecond // 1000
+        if not (self.show_seconds or self.blink_colon):
+            delay += (59 - now.second) * 1000
+        return delay
+
+    def get_text(self):
+        hour, minute, second = self.time
+        separator = " " if self.blink_colon and second % 2 == 1 else ":"
+        if self.show_seconds:
+            return "{:02}{}{:02}{}{:02}".format(hour, separator, minute, separator, second)
+        return "{:02}{}{:02}".format(hour, separator, minute)
+
+    def pop_damage(self):
+        damage = self.damage
+        self.damage = []
+        return damage
+
+    def hard_refresh(self):
+        self.background = Resource.newFrame(Resource.UI, Resource.UI_CLOCK_BACKGROUND)
+        self.font = Resource.getFont(Resource.FONT_DEFAULT)
+        self.text = CellText(self.font, len(self.get_text()))
+        size = (self.text.get_width() + 2*self.lateral_margin, self.background.get_height())
 
         self.background.resize(size)
         pygame.Surface.__init__(self, size, pygame.HWSURFACE | pygame.SRCALPHA)
 
-        self.layer.change_surface(self.clock_id, clock)
-        self.layer.resize(size)
-        self.layer.refresh()
+        self.text.set_text(self.get_text())
+        pygame.Surface.blit(self, self.background, (0, 0))
+        pygame.Surface.blit(self, self.text, self.text_pos)
+        self.damage = [pygame.Rect((0, 0), size)]
 
-        pygame.Surface.blit(self, self.layer, (0, 0))
+    def refresh(self):
+        # Only the glyph cells which changed are drawn again over their background
+        for rect in self.text.set_text(self.get_text()):
+            target = rect.move(self.text_pos)
+            self.fill(pygame.Color(0, 0, 0, 0), target)
+            pygame.Surface.blit(self, self.background, target, target)
+            pygame.Surface.blit(self, self.text, target, rect)
+            self.damage.append(target)
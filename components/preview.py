@@ -0,0 +1,272 @@
+################################################################################
+# Filename: components/preview.py                                              #
+# Created by: Venceslas Duet                                                   #
+# Created at: 10-19-2026                                                       #
+# Last update at: 10-19-2026                                                   #
+# Description: Attract mode preview player streaming image sequences and raw  #
+# frame dumps                                                                  #
+# Licence: None                                                                #
+################################################################################
+
+import os
+import queue
+import threading
+import time
+
+import pygame
+
+from elements import BaseElement
+from recorder import RAW_HEADER
+
+
+def fit_into(image, buffer):
+    if image.get_size() == buffer.get_size():
+        buffer.blit(image, (0, 0))
+    else:
+        buffer.blit(pygame.transform.scale(image, buffer.get_size()), (0, 0))
+
+
+class ImageSequence:
+    """!@brief Frames read from the images of a directory, in file name order"""
+
+    EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tga")
+
+    def __init__(self, path):
+        self.files = sorted(os.path.join(path, i) for i in os.listdir(path)
+                            if i.lower().endswith(ImageSequence.EXTENSIONS))
+        if not self.files:
+            raise ValueError("path needs to contain at least one image")
+
+    def read(self, index, buffer):
+        fit_into(pygame.image.load(self.files[index % len(self.files)]), buffer)
+
+    def close(self):
+        pass
+
+
+class RawFrames:
+    """!@brief Frames read from a frames.raw dump written by the FrameRecorder
+
+    Frames are read in order, skipped frames only cost a header read and a seek.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        # Index of the next frame in the file, and number of frames once the end has been reached
+        self.position = 0
+        self.count = None
+
+    def rewind(self):
+        if self.position == 0:
+            raise ValueError("raw file needs to contain at least one frame")
+        self.count = self.position
+        self.file.seek(0)
+        self.position = 0
+
+    def read(self, index, buffer):
+        target = index if self.count is None else index % self.count
+        if target < self.position:
+            self.file.seek(0)
+            self.position = 0
+        while True:
+            header = self.file.read(RAW_HEADER.size)
+            if len(header) < RAW_HEADER.size:
+                self.rewind()
+                target = index % self.count
+                continue
+            _, width, height, pitch, layout = RAW_HEADER.unpack(header)
+            if self.position != target:
+                self.file.seek(pitch * height, os.SEEK_CUR)
+                self.position += 1
+                continue
+            data = self.file.read(pitch * height)
+            if len(data) < pitch * height:
+                # Dump cut while recording
+                self.rewind()
+                target = index % self.count
+                continue
+            if pitch != width * 4:
+                data = b"".join(data[i * pitch:i * pitch + width * 4] for i in range(height))
+            fit_into(pygame.image.frombuffer(data, (width, height), layout.decode()), buffer)
+            self.position += 1
+            return
+
+    def close(self):
+        self.file.close()
+
+
+class Preview(BaseElement):
+    """!@brief Plays a looping preview decoded ahead by a background thread
+
+    The decoder fills a bounded ring of reusable surfaces and never decodes a frame which is already
+    late. The render loop takes the most recent due frame without waiting: when the decoder falls
+    behind, the previous frame stays on screen and the late ones are dropped.
+
+    @param size Size of the preview
+    @param fps Frame rate of the preview
+    @param buffers Number of decoded frames kept ahead
+    @param time_source Function returning the current time in seconds
+    """
+
+    def __init__(self, size, fps=30, buffers=4, time_source=time.perf_counter):
+        if fps <= 0:
+            raise ValueError("fps needs to be upper to 0")
+        if buffers <= 0:
+            raise ValueError("buffers needs to be upper to 0")
+        self.fps = fps
+        self.buffers = buffers
+        self.time_source = time_source
+        self.media = None
+        self.source = None
+        self.thread = None
+        self.stopping = threading.Event()
+        self.free = None
+        self.ready = None
+        self.start = 0.0
+        self.shown = -1
+        self.dropped = 0
+        self.size = size
+        self.resize(size)
+
+    def is_selectable(self):
+        return False
+
+    def resize(self, size):
+        # Paths are opened again at the new size, source objects are closed by the decoder
+        media = self.media if self.is_playing() and isinstance(self.media, str) else None
+        self.stop()
+        self.size = (max(1, size[0]), max(1, size[1]))
+        pygame.Surface.__init__(self, self.size)
+        self.fill(pygame.Color(0, 0, 0))
+        if media is not None:
+            self.play(media)
+
+    def play(self, source):
+        """!@brief Starts the preview of a directory of images, a frames.raw dump or a source object"""
+        self.stop()
+        self.media = source
+        if isinstance(source, str):
+            source = ImageSequence(source) if os.path.isdir(source) else RawFrames(source)
+        self.source = source
+        self.free = queue.Queue()
+        self.ready = queue.Queue()
+        for i in range(self.buffers):
+            self.free.put(pygame.Surface(self.size))
+        self.stopping = threading.Event()
+        self.start = self.time_source()
+        self.shown = -1
+        self.thread = threading.Thread(target=self.decode, name="preview", daemon=True,
+                                       args=(source, self.free, self.ready, self.stopping))
+        self.thread.start()
+
+    def stop(self):
+        # The decoder closes its source when it sees the stop, focus changes never wait for it
+        self.stopping.set()
+        self.thread = None
+        self.source = None
+        # Dropping the queues frees the ring buffers
+        self.free = None
+        self.ready = None
+
+    def is_playing(self):
+        return self.thread is not None
+
+    def due_frame(self):
+        return int((self.time_source() - self.start) * self.fps)
+
+    def decode(self, source, free, ready, stopping):
+        index = 0
+        try:
+            while not stopping.is_set():
+                try:
+                    buffer = free.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                # Frames already late when the buffer gets free are never decoded
+                index = max(index, self.due_frame())
+                source.read(index, buffer)
+                ready.put((index, buffer))
+                index += 1
+        except (pygame.error, OSError, ValueError):
+            pass
+        finally:
+            source.close()
+
+    def update(self):
+        """!@brief Shows the most recent due frame, returns True when the preview changed"""
+        if self.ready is None:
+            return False
+        due = self.due_frame()
+        frame = None
+        while True:
+            try:
+                index, buffer = self.ready.queue[0]
+            except IndexError:
+                break
+            if index > due:
+                break
+            self.ready.get_nowait()
+            if frame is not None:
+                self.dropped += 1
+                self.free.put(frame[1])
+            frame = (index, buffer)
+        if frame is None:
+            return False
+        pygame.Surface.blit(self, frame[1], (0, 0))
+        self.free.put(frame[1])
+        self.shown = frame[0]
+        return True
+
+    def next_delay(self):
+        if self.ready is None:
+            return None
+        return max(0, int(((self.due_frame() + 1) / self.fps - (self.time_source() - self.start)) * 1000))
+
+    def refresh(self):
+        self.update()
+
+    def hard_refresh(self):
+        pass
+
+    def enable(self):
+        pass
+
+    def disable(self):
+        self.stop()
+
+    def set_hover(self):
+        pass
+
+    def set_active(self):
+        pass
+
+    def set_normal(self):
+        # Focus moved away
+        self.stop()
+
+    def event_enter(self):
+        pass
+
+    def event_left(self):
+        pass
+
+    def event_right(self):
+        pass
+
+    def event_top(self):
+        pass
+
+    def event_bottom(self):
+        pass
+
+    def event_mouse_hover(self, pos):
+        pass
+
+    def event_mouse_click(self, pos, button):
+        pass
+
+    def event_mouse_leave(self):
+        pass
+
+    def event_mouse_scroll(self, pos, amount):
+        pass
@@ -0,0 +1,127 @@
+################################################################################
+# Filename: components/searchbox.py                                            #
+# Created by: Venceslas Duet                                                   #
+# Created at: 10-19-2026                                                       #
+# Last update at: 10-19-2026                                                   #
+# Description: Type-ahead search component over the game catalog               #
+# Licence: None                                                                #
+################################################################################
+
+import pygame
+
+from resource import Resource
+
+from elements import BaseElement
+
+
+class SearchBox(BaseElement):
+    def __init__(self, index, rows=8):
+        if not isinstance(rows, int) or rows <= 0:
+            raise ValueError("rows needs to be a integer upper to 0")
+        self.index = index
+        self.rows = rows
+        self.query = ""
+        self.results = []
+        self.selected = 0
+        self.first = 0
+        self.enabled = True
+        self.font = Resource.getFont(Resource.FONT_DEFAULT)
+        self.size = (1, 1)
+
+        self.resize(self.size)
+
+    def is_selectable(self):
+        return True
+
+    def resize(self, size):
+        self.size = (max(1, size[0]), (self.rows + 1) * self.font.canvas[1])
+        pygame.Surface.__init__(self, self.size, pygame.HWSURFACE | pygame.SRCALPHA)
+        self.refresh()
+
+    def set_query(self, query):
+        self.query = query
+        self.results = self.index.search(query)
+        self.selected = 0
+        self.first = 0
+        self.refresh()
+
+    def type_text(self, text):
+        self.set_query(self.query + text)
+
+    def backspace(self):
+        if self.query:
+            self.set_query(self.query[:-1])
+
+    def get_selection(self):
+        if self.selected < len(self.results):
+            return self.results[self.selected]
+        return None
+
+    def select(self, position):
+        if not self.results:
+            return
+        self.selected = max(0, min(position, len(self.results) - 1))
+        if self.selected < self.first:
+            self.first = self.selected
+        elif self.selected >= self.first + self.rows:
+            self.first = self.selected - self.rows + 1
+        self.refresh()
+
+    def hard_refresh(self):
+        self.font = Resource.getFont(Resource.FONT_DEFAULT)
+        self.resize(self.size)
+
+    def refresh(self):
+        width = self.get_width()
+        height = self.font.canvas[1]
+        self.fill(pygame.Color(0, 0, 0, 0))
+        pygame.Surface.blit(self, self.font.gen_text(self.font.truncate("> " + self.query, width)), (0, 0))
+        for row in range(min(self.rows, len(self.results) - self.first)):
+            position = self.first + row
+            prefix = "* " if position == self.selected else "  "
+            line = self.font.truncate(prefix + self.index.titles[self.results[position]], width)
+            pygame.Surface.blit(self, self.font.gen_text(line), (0, (row + 1) * height))
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def set_hover(self):
+        pass
+
+    def set_active(self):
+        pass
+
+    def set_normal(self):
+        pass
+
+    def event_enter(self):
+        pass
+
+    def event_left(self):
+        pass
+
+    def event_right(self):
+        pass
+
+    def event_top(self):
+        self.select(self.selected - 1)
+
+    def event_bottom(self):
+        self.select(self.selected + 1)
+
+    def event_mouse_hover(self, pos):
+        pass
+
+    def event_mouse_click(self, pos, button):
+        row = pos[1] // self.font.canvas[1] - 1
+        if button == BaseElement.MOUSE_LEFT and row >= 0:
+            self.select(self.first + row)
+
+    def event_mouse_leave(self):
+        pass
+
+    def event_mouse_scroll(self, pos, amount):
+        self.select(self.selected - amount)
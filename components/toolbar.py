@@ -2,7 +2,7 @@
 # Filename: components/toolbar.py                                              #
 # Created by: Venceslas Duet                                                   #
 # Created at: 03-14-2022                                                       #
-# Last update at: 03-15-2022                                                   #
+# Last update at: 10-19-2026                                                   #
 # Description: Toolbar component                                               #
 # Licence: None                                                                #
 ################################################################################
@@ -20,7 +20,7 @@ class Toolbar(BaseElement):
     size = None
 
     def __init__(self):
-        self.background = Resource.getImage(Resource.UI, Resource.UI_TOOLBAR_BACKGROUND)
+        self.background = Resource.newFrame(Resource.UI, Resource.UI_TOOLBAR_BACKGROUND)
         self.logo = Resource.getImage(Resource.MISC, Resource.PIXEL_LOGO)
         self.background_height = 17
         self.toolbar_height = max(self.background_height, self.logo.get_height())
@@ -37,6 +37,11 @@ class Toolbar(BaseElement):
         return False
 
     def resize(self, size):
+        """!@brief Draws the toolbar again at the width of size
+        @return False when the width is the current one and nothing was drawn
+        """
+        if (max(1, size[0]), self.toolbar_height) == self.size:
+            return False
         self.size = (max(1, size[0]), self.toolbar_height)
 
         pygame.Surface.__init__(self, self.size, pygame.HWSURFACE | pygame.SRCALPHA)
@@ -47,13 +52,20 @@ class Toolbar(BaseElement):
         self.layer.refresh()
 
         pygame.Surface.blit(self, self.layer, (0, 0))
+        return True
 
     def hard_refresh(self):
-        self.background = Resource.getImage(Resource.UI, Resource.UI_TOOLBAR_BACKGROUND)
+        self.background = Resource.newFrame(Resource.UI, Resource.UI_TOOLBAR_BACKGROUND)
         self.logo = Resource.getImage(Resource.MISC, Resource.PIXEL_LOGO)
         self.toolbar_height = max(self.background_height, self.logo.get_height())
-
-        self.refresh()
+        self.layer.change_surface(0, self.background)
+        self.layer.change_surface(1, Resource.getImage(Resource.ICON, Resource.ICON_JOYSTICK))
+        self.layer.change_surface(2, self.logo)
+
+        # Rendered again at the current width with the new images
+        width = self.size[0]
+        self.size = None
+        self.resize((width, self.toolbar_height))
 
     def disable(self):
         pass
@@ -2,12 +2,13 @@
 # Filename: config.py                                                          #
 # Created by: Venceslas Duet                                                   #
 # Created at: 04-05-2018                                                       #
-# Last update at: 03-15-2022                                                   #
+# Last update at: 10-19-2026                                                   #
 # Description: Manage configuration into program                               #
 # Licence: None                                                                #
 ################################################################################
 
 import json
+import os
 
 
 class Object:
@@ -19,6 +20,23 @@ class Config:
     expand = False
     use_song = True
     song_volume = 1.0
+    # Presentation backend: "surface", "texture" or "software"
+    renderer = "surface"
+    # Present input-driven changes as soon as the event batch is handled
+    low_latency = False
+    # Frame recorder output: "png" sequence or "raw" dump
+    record_format = "png"
+    # Skip argument validation in graphics hot paths
+    release_mode = False
+    # Local port of the Prometheus metrics endpoint, 0 to disable it
+    metrics_port = 0
+    # Scanline, shadow mask and vignette effect on the presented frame (surface renderer only)
+    crt_effect = False
+
+    SETTINGS = ("expand", "use_song", "song_volume", "renderer", "low_latency", "record_format", "release_mode",
+                "metrics_port", "crt_effect")
+    # State journal keeping the setting changes not saved in the file yet (journal.StateJournal)
+    journal = None
 
     @staticmethod
     def load(config_path="resource/config.json"):
@@ -31,6 +49,10 @@ class Config:
             data = json.loads(line)
         except:
             return
+        Config.apply(data)
+
+    @staticmethod
+    def apply(data):
         if "expand" in data:
             if isinstance(data["expand"], bool):
                 Config.expand = data["expand"]
@@ -41,11 +63,49 @@ class Config:
             if isinstance(data["song_volume"], int) or isinstance(data["song_volume"], float):
                 if 0 <= data["song_volume"] <= 1:
                     Config.song_volume = float(data["song_volume"])
+        if "low_latency" in data:
+            if isinstance(data["low_latency"], bool):
+                Config.low_latency = data["low_latency"]
+        if "metrics_port" in data:
+            if isinstance(data["metrics_port"], int) and 0 <= data["metrics_port"] <= 65535:
+                Config.metrics_port = data["metrics_port"]
+        if "crt_effect" in data:
+            if isinstance(data["crt_effect"], bool):
+                Config.crt_effect = data["crt_effect"]
+        if "release_mode" in data:
+            if isinstance(data["release_mode"], bool):
+                Config.release_mode = data["release_mode"]
+        if "record_format" in data:
+            if data["record_format"] in ["png", "raw"]:
+                Config.record_format = data["record_format"]
+        if "renderer" in data:
+            if data["renderer"] in ["surface", "texture", "software"]:
+                Config.renderer = data["renderer"]
+
+    @staticmethod
+    def attach(journal):
+        """!@brief Applies the changes of the journal not saved in the file and journals the next ones"""
+        Config.journal = journal
+        Config.apply(journal.get_settings())
+
+    @staticmethod
+    def set(key, value):
+        if key not in Config.SETTINGS:
+            raise ValueError("key needs to be a setting name")
+        Config.apply({key: value})
+        if Config.journal is not None:
+            Config.journal.set_setting(key, getattr(Config, key))
 
     @staticmethod
     def save(config_path="resource/config.json"):
         to_save = Object()
-        to_save.use_song = Config.use_song
-        to_save.song_volume = Config.song_volume
-        file = open(config_path, 'w')
-        file.write(to_save.toJSON())
+        for i in Config.SETTINGS:
+            setattr(to_save, i, getattr(Config, i))
+        with open(config_path + ".tmp", 'w') as file:
+            file.write(to_save.toJSON())
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(config_path + ".tmp", config_path)
+        if Config.journal is not None:
+            # The file holds the changes now, later edits of it are not overridden at startup
+            Config.journal.clear_settings()
@@ -0,0 +1,229 @@
+################################################################################
+# Filename: controls.py                                                        #
+# Created by: Venceslas Duet                                                   #
+# Created at: 10-19-2026                                                       #
+# Last update at: 10-19-2026                                                   #
+# Description: Keyboard and joystick mapping to the launcher actions           #
+# Licence: None                                                                #
+################################################################################
+
+import json
+import os
+import time
+
+import pygame
+
+
+class Action:
+    LEFT = "left"
+    RIGHT = "right"
+    UP = "up"
+    DOWN = "down"
+    ENTER = "enter"
+    BACK = "back"
+    QUIT = "quit"
+    RELOAD = "reload"
+    RECORD = "record"
+
+    names = [LEFT, RIGHT, UP, DOWN, ENTER, BACK, QUIT, RELOAD, RECORD]
+    # Actions sent again while their input is held
+    repeated = [LEFT, RIGHT, UP, DOWN]
+
+
+class Controls:
+    """!@brief Maps keyboard keys, joystick buttons, hats and axes to actions
+
+    Every event batch gives at most one occurrence of each action, so a flood of repeated keys or
+    axis jitter from an arcade encoder costs a single dispatch per frame. Axes use a hysteresis
+    around the threshold, and held directions repeat on the launcher's own timer.
+
+    @param time_source Function returning the current time in seconds
+    """
+
+    DEFAULT_KEYS = {
+        Action.LEFT: ["left"],
+        Action.RIGHT: ["right"],
+        Action.UP: ["up"],
+        Action.DOWN: ["down"],
+        Action.ENTER: ["return"],
+        Action.BACK: ["backspace"],
+        Action.QUIT: ["escape"],
+        Action.RELOAD: ["r"],
+        Action.RECORD: ["f12"]
+    }
+    DEFAULT_BUTTONS = {
+        Action.ENTER: [0],
+        Action.BACK: [1]
+    }
+
+    def __init__(self, time_source=time.perf_counter):
+        self.time_source = time_source
+        self.keys = {}
+        self.buttons = {}
+        # Joystick axes used as (horizontal, vertical) directions
+        self.axes = (0, 1)
+        self.axis_threshold = 0.5
+        self.repeat_delay = 0.4
+        self.repeat_interval = 0.1
+        self.joysticks = {}
+
+        # Inputs currently holding each action, and next repeat time of the held directions
+        self.sources = {i: set() for i in Action.names}
+        self.next_repeat = {}
+        self.set_bindings(Controls.DEFAULT_KEYS, Controls.DEFAULT_BUTTONS)
+
+    def set_bindings(self, keys, buttons):
+        self.keys = {}
+        self.buttons = {}
+        for action, names in keys.items():
+            if action not in Action.names:
+                raise ValueError("Action called {} is unavailable. Please check controls.json".format(action))
+            for name in names:
+                try:
+                    self.keys[pygame.key.key_code(name)] = action
+                except ValueError:
+                    raise ValueError("Key called {} is unavailable. Please check controls.json".format(name))
+        for action, numbers in buttons.items():
+            if action not in Action.names:
+                raise ValueError("Action called {} is unavailable. Please check controls.json".format(action))
+            for number in numbers:
+                if not isinstance(number, int):
+                    raise ValueError("Joystick buttons need to be integers. Please check controls.json")
+                self.buttons[number] = action
+
+    def load(self, path="resource/controls.json"):
+        if not os.path.isfile(path):
+            return
+        with open(path, "r") as file:
+            data = json.load(file)
+        keys = dict(Controls.DEFAULT_KEYS)
+        keys.update(data.get("keys", {}))
+        buttons = dict(Controls.DEFAULT_BUTTONS)
+        buttons.update(data.get("buttons", {}))
+        self.set_bindings(keys, buttons)
+        if "axes" in data:
+            if isinstance(data["axes"], list) and len(data["axes"]) == 2 and all(isinstance(i, int) for i in data["axes"]):
+                self.axes = tuple(data["axes"])
+        if "axis_threshold" in data:
+            if isinstance(data["axis_threshold"], (int, float)) and 0 < data["axis_threshold"] < 1:
+                self.axis_threshold = float(data["axis_threshold"])
+        if "repeat_delay" in data:
+            if isinstance(data["repeat_delay"], int) and data["repeat_delay"] > 0:
+                self.repeat_delay = data["repeat_delay"] / 1000
+        if "repeat_interval" in data:
+            if isinstance(data["repeat_interval"], int) and data["repeat_interval"] > 0:
+                self.repeat_interval = data["repeat_interval"] / 1000
+
+    def open_joysticks(self):
+        pygame.joystick.init()
+        for i in range(pygame.joystick.get_count()):
+            joystick = pygame.joystick.Joystick(i)
+            self.joysticks[joystick.get_instance_id()] = joystick
+
+    def press(self, source, action, actions, now):
+        if not self.sources[action]:
+            actions[action] = True
+            if action in Action.repeated:
+                self.next_repeat[action] = now + self.repeat_delay
+        self.sources[action].add(source)
+
+    def release(self, source, action):
+        self.sources[action].discard(source)
+        if not self.sources[action]:
+            self.next_repeat.pop(action, None)
+
+    def set_direction(self, source, value, negative, positive, actions, now):
+        if value < 0:
+            self.release(source, positive)
+            self.press(source, negative, actions, now)
+        elif value > 0:
+            self.release(source, negative)
+            self.press(source, positive, actions, now)
+        else:
+            self.release(source, negative)
+            self.release(source, positive)
+
+    def axis_direction(self, source, value, negative, positive):
+        # Leaving a direction needs the axis to come back under a lower threshold
+        held = source in self.sources[negative] or source in self.sources[positive]
+        threshold = self.axis_threshold * 0.6 if held else self.axis_threshold
+        if value <= -threshold:
+            return -1
+        if value >= threshold:
+            return 1
+        return 0
+
+    def process(self, events):
+        """!@brief Translates an event batch into the list of actions triggered, each at most once"""
+        now = self.time_source()
+        actions = {}
+        for event in events:
+            match event.type:
+                case pygame.KEYDOWN:
+                    if event.key in self.keys:
+                        self.press(("key", event.key), self.keys[event.key], actions, now)
+                case pygame.KEYUP:
+                    if event.key in self.keys:
+                        self.release(("key", event.key), self.keys[event.key])
+                case pygame.JOYBUTTONDOWN:
+                    if event.button in self.buttons:
+                        self.press(("button", event.instance_id, event.button), self.buttons[event.button], actions, now)
+                case pygame.JOYBUTTONUP:
+                    if event.button in self.buttons:
+                        self.release(("button", event.instance_id, event.button), self.buttons[event.button])
+                case pygame.JOYHATMOTION:
+                    source = ("hat", event.instance_id, event.hat)
+                    self.set_direction(source + ("x",), event.value[0], Action.LEFT, Action.RIGHT, actions, now)
+                    # Hats report up as positive
+                    self.set_direction(source + ("y",), -event.value[1], Action.UP, Action.DOWN, actions, now)
+                case pygame.JOYAXISMOTION:
+                    if event.axis == self.axes[0]:
+                        source = ("axis", event.instance_id, event.axis)
+                        value = self.axis_direction(source, event.value, Action.LEFT, Action.RIGHT)
+                        self.set_direction(source, value, Action.LEFT, Action.RIGHT, actions, now)
+                    elif event.axis == self.axes[1]:
+                        source = ("axis", event.instance_id, event.axis)
+                        value = self.axis_direction(source, event.value, Action.UP, Action.DOWN)
+                        self.set_direction(source, value, Action.UP, Action.DOWN, actions, now)
+                case pygame.JOYDEVICEADDED:
+                    joystick = pygame.joystick.Joystick(event.device_index)
+                    self.joysticks[joystick.get_instance_id()] = joystick
+                case pygame.JOYDEVICEREMOVED:
+                    self.joysticks.pop(event.instance_id, None)
+                    for action in Action.names:
+                        for source in list(self.sources[action]):
+                            if source[0] != "key" and source[1] == event.instance_id:
+                                self.release(source, action)
+
+        # Held directions repeat once per batch, however late the batch is
+        for action, at in list(self.next_repeat.items()):
+            if now >= at:
+                actions[action] = True
+                at += self.repeat_interval
+                self.next_repeat[action] = at if at > now else now + self.repeat_interval
+        return list(actions)
+
+    def next_delay(self):
+        if not self.next_repeat:
+            return None
+        return max(0, int((min(self.next_repeat.values()) - self.time_source()) * 1000))
+
+    @staticmethod
+    def dispatch(actions, element):
+        """!@brief Sends the directional and enter actions to the focused element
+
+        @return True when at least one action reached the element
+        """
+        if element is None:
+            return False
+        delivered = False
+        for action in actions:
+            match action:
+                case Action.LEFT: element.event_left()
+                case Action.RIGHT: element.event_right()
+                case Action.UP: element.event_top()
+                case Action.DOWN: element.event_bottom()
+                case Action.ENTER: element.event_enter()
+                case _: continue
+            delivered = True
+        return delivered
@@ -2,12 +2,16 @@
 # Filename: graphics/__init__.py                                               #
 # Created by: Venceslas Duet                                                   #
 # Created at: 04-04-2018                                                       #
-# Last update at: 03-15-2022                                                   #
+# Last update at: 10-19-2026                                                   #
 # Description: 2D drawing primitives                                           #
 # Licence: None                                                                #
 ################################################################################
 
+from .atlas import *
 from .background import *
 from .frame import *
 from .layer import *
+from .postprocess import *
+from .presenter import *
 from .text import *
+from .tween import *
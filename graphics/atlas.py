@@ -0,0 +1,104 @@
+################################################################################
+# Filename: graphics/atlas.py                                                  #
+# Created by: Venceslas Duet                                                   #
+# Created at: 10-19-2026                                                       #
+# Last update at: 10-19-2026                                                   #
+# Description: Texture atlas packing many small images into a few large        #
+# surfaces                                                                     #
+# Licence: None                                                                #
+################################################################################
+
+import json
+import os
+
+import pygame
+
+
+class Atlas:
+    """!@brief Set of large surfaces (pages) holding packed images
+
+    Images are handed out as subsurfaces of the pages: they are lightweight (page, rect) views sharing
+    the page pixels, usable anywhere a pygame.Surface is expected.
+    """
+
+    PAGE_SIZE = (1024, 1024)
+    # Transparent border kept around each image so filtered scaling never samples a neighbour
+    PADDING = 1
+
+    def __init__(self, pages, placements):
+        self.pages = pages
+        self.placements = placements
+
+    def get(self, key):
+        page, rect = self.placements[key]
+        return self.pages[page].subsurface(rect)
+
+    def __contains__(self, key):
+        return key in self.placements
+
+    @staticmethod
+    def pack(sizes, page_size=PAGE_SIZE, padding=PADDING):
+        """!@brief Shelf packing of {key: (width, height)}
+
+        @return ({key: (page, x, y)}, [page sizes])
+        """
+        placements = {}
+        pages = []
+        current = None
+        shelf_x = shelf_y = shelf_height = 0
+        order = sorted(sizes, key=lambda key: (-sizes[key][1], -sizes[key][0], key))
+        for key in order:
+            width = sizes[key][0] + 2 * padding
+            height = sizes[key][1] + 2 * padding
+            if width > page_size[0] or height > page_size[1]:
+                # Oversized images get a page of their own
+                placements[key] = (len(pages), padding, padding)
+                pages.append([width, height])
+                continue
+            if shelf_x + width > page_size[0]:
+                shelf_y += shelf_height
+                shelf_x = shelf_height = 0
+            if current is None or shelf_y + height > page_size[1]:
+                pages.append([0, 0])
+                current = len(pages) - 1
+                shelf_x = shelf_y = shelf_height = 0
+            placements[key] = (current, shelf_x + padding, shelf_y + padding)
+            shelf_x += width
+            shelf_height = max(shelf_height, height)
+            pages[current] = [max(pages[current][0], shelf_x), max(pages[current][1], shelf_y + shelf_height)]
+        return placements, [tuple(i) for i in pages]
+
+    @staticmethod
+    def build(images, cache_path=None):
+        """!@brief Packs {key: surface} into an atlas, reusing the packing saved in cache_path when still valid"""
+        sizes = {key: images[key].get_size() for key in images}
+        signature = [[key, sizes[key][0], sizes[key][1]] for key in sorted(sizes)]
+
+        placements = None
+        if cache_path is not None and os.path.isfile(cache_path):
+            try:
+                with open(cache_path, "r") as file:
+                    data = json.load(file)
+                if data["signature"] == signature and data["page_size"] == list(Atlas.PAGE_SIZE):
+                    placements = {key: tuple(value) for key, value in data["placements"].items()}
+                    page_sizes = [tuple(i) for i in data["pages"]]
+            except (ValueError, KeyError, TypeError):
+                placements = None
+
+        if placements is None:
+            placements, page_sizes = Atlas.pack(sizes)
+            if cache_path is not None:
+                if os.path.dirname(cache_path):
+                    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                with open(cache_path + ".tmp", "w") as file:
+                    json.dump({"signature": signature, "page_size": list(Atlas.PAGE_SIZE),
+                               "placements": placements, "pages": page_sizes}, file)
+                os.replace(cache_path + ".tmp", cache_path)
+
+        pages = [pygame.Surface(i, pygame.HWSURFACE | pygame.SRCALPHA) for i in page_sizes]
+        rects = {}
+        for key in images:
+            page, x, y = placements[key]
+            pages[page].blit(images[key], (x, y))
+            rects[key] = (page, pygame.Rect((x, y), sizes[key]))
+        return Atlas(pages, rects)
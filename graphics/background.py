@@ -2,39 +2,171 @@
 # Filename: graphics/background.py                                             #
 # Created by: Venceslas Duet                                                   #
 # Created at: 02-14-2018                                                       #
-# Last update at: 03-15-2022                                                   #
+# Last update at: 10-19-2026                                                   #
 # Description: Class for generating size agnostic background. This class work  #
 # in pygame (SDL 2 python binding) library                                     #
 # Licence: None                                                                #
 ################################################################################
 
-# TODO: Implement image background support
-
 import pygame
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def gradient_strip(colors, length, direction):
+    """!@brief Renders a 1 pixel thick gradient going through colors, stretched afterwards to the background size"""
+    length = max(1, length)
+    size = (1, length) if direction == Background.VERTICAL else (length, 1)
+    strip = pygame.Surface(size)
+    channels = [[tuple(i)[c] for i in colors] for c in range(3)]
+    if numpy is not None:
+        t = numpy.linspace(0.0, 1.0, length)
+        stops = numpy.linspace(0.0, 1.0, len(colors))
+        line = numpy.stack([numpy.interp(t, stops, i) for i in channels], axis=-1).round().astype(numpy.uint8)
+        pygame.surfarray.blit_array(strip, line[None, :, :] if direction == Background.VERTICAL else line[:, None, :])
+    else:
+        for i in range(length):
+            position = i / (length - 1) * (len(colors) - 1) if length > 1 else 0
+            low = min(int(position), len(colors) - 2)
+            k = position - low
+            color = [round(c[low] + (c[low + 1] - c[low]) * k) for c in channels]
+            strip.set_at((0, i) if direction == Background.VERTICAL else (i, 0), color)
+    return strip
+
+
+class BackgroundLayer:
+    def __init__(self, image, tile_size, repeat_x, repeat_y, speed):
+        if tile_size != image.get_size():
+            image = pygame.transform.smoothscale(image, tile_size)
+        self.tile = image
+        self.repeat_x = repeat_x
+        self.repeat_y = repeat_y
+        self.speed = speed
+        # Tiles repeated once for the whole view plus one tile, scrolled views are windows into it
+        self.pattern = None
+
+    def prepare(self, view_size):
+        width, height = self.tile.get_size()
+        needed = (view_size[0] + width if self.repeat_x else width,
+                  view_size[1] + height if self.repeat_y else height)
+        if self.pattern is not None and self.pattern.get_width() >= needed[0] and self.pattern.get_height() >= needed[1]:
+            return
+        self.pattern = pygame.Surface(needed, pygame.HWSURFACE | pygame.SRCALPHA)
+        for x in range(0, needed[0], width):
+            for y in range(0, needed[1], height):
+                self.pattern.blit(self.tile, (x, y))
+
+    def draw(self, target, offset):
+        width, height = self.tile.get_size()
+        x = int(offset[0] * self.speed[0])
+        y = int(offset[1] * self.speed[1])
+        source = [0, 0]
+        dest = [0, 0]
+        if self.repeat_x:
+            source[0] = x % width
+        else:
+            dest[0] = -x
+        if self.repeat_y:
+            source[1] = y % height
+        else:
+            dest[1] = -y
+        target.blit(self.pattern, dest, (source[0], source[1], target.get_width(), target.get_height()))
+
 
 class Background(pygame.Surface):
+    HORIZONTAL = 0
+    VERTICAL = 1
+
     def __init__(self, size, plain_color=pygame.Color(0, 0, 0),
                  image=None,
                  image_width=-1, image_height=-1,
-                 image_repeat_x=1, image_repeat_y=1):
-        """!@brief Creates a new Gradient object
+                 image_repeat_x=1, image_repeat_y=1,
+                 gradient=None, gradient_direction=VERTICAL):
+        """!@brief Creates a new Background object
 
-        The Gradient object that create quickly gradient in pygame.Surface
+        The Background is a plain colour or a gradient, with optional tiled image layers scrolled at
+        their own speed (parallax). Patterns are rendered once, scrolling only blits a window of them.
 
         @param size The background surface size
         @param plain_color The main colour of the background
         @param image The texture to draw as wallpaper. Is image=None then only the plain_color is shown
         @param image_width The width of the image. If image_width=-1 then the width is automatically calculated
         @param image_height The height of the image. If image_height=-1 then the height is automatically calculated
+        @param image_repeat_x Repeat the image horizontally (0 draws it once)
+        @param image_repeat_y Repeat the image vertically (0 draws it once)
+        @param gradient List of at least 2 colours replacing plain_color with a gradient
+        @param gradient_direction Background.VERTICAL or Background.HORIZONTAL
         """
         self.color = plain_color
-        self.resize(size)
+        self.gradient = gradient
+        self.gradient_direction = gradient_direction
+        self.base = None
+        self.layers = []
+        self.offset = (0, 0)
+        pygame.Surface.__init__(self, size)
+        if image is not None:
+            self.add_layer(image, (1.0, 1.0), image_width, image_height, image_repeat_x, image_repeat_y)
+        self.compose()
+
+    def add_layer(self, image, speed=(1.0, 1.0), image_width=-1, image_height=-1, repeat_x=1, repeat_y=1):
+        if not isinstance(image, pygame.Surface):
+            raise TypeError("image needs to be a pygame.Surface")
+        width, height = image.get_size()
+        # Keep the image ratio when only one dimension is given
+        if image_width > 0 and image_height <= 0:
+            height = max(1, height * image_width // width)
+            width = image_width
+        elif image_height > 0 and image_width <= 0:
+            width = max(1, width * image_height // height)
+            height = image_height
+        elif image_width > 0 and image_height > 0:
+            width, height = image_width, image_height
+        self.layers.append(BackgroundLayer(image, (width, height), bool(repeat_x), bool(repeat_y), speed))
+        self.layers[-1].prepare(self.get_size())
+        return len(self.layers) - 1
 
     def change_color(self, color):
         self.color = color
-        self.resize(self.get_size())
+        self.base = None
+        self.compose()
+
+    def change_gradient(self, gradient, direction=VERTICAL):
+        self.gradient = gradient
+        self.gradient_direction = direction
+        self.base = None
+        self.compose()
+
+    def set_offset(self, offset):
+        self.offset = offset
+        self.compose()
+
+    def scroll(self, dx, dy):
+        self.set_offset((self.offset[0] + dx, self.offset[1] + dy))
 
     def resize(self, size):
+        """!@brief Draws the background again at size
+        @return False when size is the current one and nothing was drawn
+        """
+        if tuple(size) == self.get_size():
+            return False
         pygame.Surface.__init__(self, size)
-        self.fill(self.color, (0, 0, size[0], size[1]))
+        self.base = None
+        for i in self.layers:
+            i.prepare(size)
+        self.compose()
+        return True
+
+    def compose(self):
+        size = self.get_size()
+        if self.gradient is None:
+            self.fill(self.color, (0, 0, size[0], size[1]))
+        else:
+            if self.base is None:
+                length = size[1] if self.gradient_direction == Background.VERTICAL else size[0]
+                self.base = pygame.transform.scale(gradient_strip(self.gradient, length, self.gradient_direction), size)
+            self.blit(self.base, (0, 0))
+        for i in self.layers:
+            i.draw(self, self.offset)
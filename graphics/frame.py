@@ -2,7 +2,7 @@
 # Filename: graphics/frame.py                                                  #
 # Created by: Venceslas Duet                                                   #
 # Created at: 04-07-2018                                                       #
-# Last update at: 03-15-2022                                                   #
+# Last update at: 10-19-2026                                                   #
 # Description: base UI system for create zoom framed image                     #
 # Licence: None                                                                #
 ################################################################################
@@ -12,7 +12,12 @@ import pygame
 import internal
 
 
-class Frame(pygame.Surface):
+class FrameTemplate:
+    """!@brief Framed image cut in 9 slices once, shared by every Frame rendered from it
+
+    Templates are never modified: each user renders its own size with instance().
+    """
+
     def __init__(self, image, margin=(0, 0, 0, 0)):
         if not isinstance(image, pygame.Surface):
             raise TypeError("image need to be pygame.Surface")
@@ -20,7 +25,8 @@ class Frame(pygame.Surface):
             raise TypeError("margin need to be (int top, int right, int bottom, int left)")
         if ((margin[0] + margin[2]) >= image.get_height()) or ((margin[1] + margin[3]) >= image.get_width()):
             raise ValueError("margin may not overlap")
-        self.margin = margin
+        self.image = image
+        self.margin = tuple(margin)
         pos_y = [
             0,
             margin[0],
@@ -38,18 +44,43 @@ class Frame(pygame.Surface):
         for i in range(3):
             line = list()
             for j in range(3):
-                element = pygame.Surface((pos_x[j + 1] - pos_x[j], pos_y[i + 1] - pos_y[i]),
-                                         pygame.HWSURFACE | pygame.SRCALPHA)
-                element.blit(image, (0, 0), (pos_x[j], pos_y[i], element.get_width(), element.get_height()))
-                line.append(element)
+                # Slices are views of the source image (usually an atlas region), not copies
+                line.append(image.subsurface((pos_x[j], pos_y[i], pos_x[j + 1] - pos_x[j], pos_y[i + 1] - pos_y[i])))
             self.elements.append(line)
-        pygame.Surface.__init__(self, image.get_size(), pygame.HWSURFACE | pygame.SRCALPHA)
-        self.blit(image, (0, 0))
+
+    def get_size(self):
+        return self.image.get_size()
+
+    def get_min_size(self):
+        return self.min_size
+
+    def instance(self, size=None):
+        return Frame(self, size=size)
+
+
+class Frame(pygame.Surface):
+    def __init__(self, image, margin=(0, 0, 0, 0), size=None):
+        """!@brief Creates a Frame rendered from a FrameTemplate, or from an image and its margin"""
+        self.template = image if isinstance(image, FrameTemplate) else FrameTemplate(image, margin)
+        self.margin = self.template.margin
+        self.min_size = self.template.min_size
+        self.elements = self.template.elements
+        self.rendered = None
+        if size is None:
+            self.rendered = self.template.get_size()
+            pygame.Surface.__init__(self, self.rendered, pygame.HWSURFACE | pygame.SRCALPHA)
+            self.blit(self.template.image, (0, 0))
+        else:
+            self.resize(size)
 
     def resize(self, size):
-        if not internal.correct_tuple(size, int, 2):
-            raise TypeError("size need to be a (int width, int height)")
+        if internal.validate:
+            if not internal.correct_tuple(size, int, 2):
+                raise TypeError("size need to be a (int width, int height)")
         size = (max(size[0], self.min_size[0]), max(size[1], self.min_size[1]))
+        if size == self.rendered:
+            return
+        self.rendered = size
         pygame.Surface.__init__(self, size, pygame.HWSURFACE | pygame.SRCALPHA)
         pos_y = [
             0,
@@ -76,35 +107,40 @@ class Frame(pygame.Surface):
 
 class MultiStateFrame(pygame.Surface):
     def __init__(self, image, states, margin=(0, 0, 0, 0), default=0):
-        if not isinstance(image, pygame.Surface):
-            raise TypeError("image need to be pygame.Surface")
+        """!@brief Creates a Frame with several states stacked vertically in image
+
+        image can also be the list of state templates of another MultiStateFrame, to share its slices
+        """
         if not isinstance(states, int):
             raise TypeError("states need to be int")
-        if not internal.correct_tuple(margin, int, 4):
-            raise TypeError("margin need to be (int top, int right, int bottom, int left)")
         if not isinstance(default, int):
             raise TypeError("default need to be int")
-        if states <= 0 or states > image.get_height():
-            raise ValueError("states need to be between 0 and height of image")
-        if default not in range(states):
+        if isinstance(image, list):
+            self.templates = image
+        else:
+            if not isinstance(image, pygame.Surface):
+                raise TypeError("image need to be pygame.Surface")
+            if not internal.correct_tuple(margin, int, 4):
+                raise TypeError("margin need to be (int top, int right, int bottom, int left)")
+            if states <= 0 or states > image.get_height():
+                raise ValueError("states need to be between 0 and height of image")
+            height = image.get_height() // states
+            self.templates = [FrameTemplate(image.subsurface((0, height * i, image.get_width(), height)), margin)
+                              for i in range(states)]
+        if default not in range(len(self.templates)):
             raise ValueError("default need to be between 0 and states number")
-        self.states = list()
-        height = image.get_height() // states
-        self.size = (image.get_width(), height)
-        self.min_size = (margin[1] + margin[3]), (margin[0] + margin[2])
+        self.size = self.templates[0].get_size()
+        self.min_size = self.templates[0].get_min_size()
         self.actual_state = default
-
-        for i in range(states):
-            part = pygame.Surface((image.get_width(), height), pygame.HWSURFACE | pygame.SRCALPHA)
-            part.blit(image, (0, 0), (0, height * i, image.get_width(), height))
-            self.states.append(Frame(part, margin))
+        # Only the shown state is rendered
+        self.state = None
 
         self.refresh()
 
     def change_state(self, state):
         if not isinstance(state, int):
             raise TypeError("state need to be int")
-        if state not in range(len(self.states)):
+        if state not in range(len(self.templates)):
             raise ValueError("state need to be between 0 and states number")
         self.actual_state = state
         self.refresh()
@@ -113,13 +149,18 @@ class MultiStateFrame(pygame.Surface):
         if not internal.correct_tuple(size, int, 2):
             raise TypeError("size need to be (int width, int height)")
         self.size = size
-        for i in range(len(self.states)):
-            self.states[i].resize(size)
         self.refresh()
 
     def get_min_size(self):
         return self.min_size
 
+    def instance(self, size=None):
+        ret = MultiStateFrame(self.templates, len(self.templates), default=self.actual_state)
+        if size is not None:
+            ret.resize(size)
+        return ret
+
     def refresh(self):
-        pygame.Surface.__init__(self, self.size, pygame.HWSURFACE | pygame.SRCALPHA)
-        self.blit(self.states[self.actual_state], (0, 0))
+        self.state = self.templates[self.actual_state].instance(self.size)
+        pygame.Surface.__init__(self, self.state.get_size(), pygame.HWSURFACE | pygame.SRCALPHA)
+        self.blit(self.state, (0, 0))
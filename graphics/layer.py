@@ -2,7 +2,7 @@
 # Filename: graphics/layers.py                                                 #
 # Created by: Venceslas Duet                                                   #
 # Created at: 03-15-2018                                                       #
-# Last update at: 03-15-2022                                                   #
+# Last update at: 10-19-2026                                                   #
 # Description: High level class for manage layers and automatically update     #
 # rendering of graphical elements                                              #
 # Licence: None                                                                #
@@ -11,17 +11,12 @@
 import pygame
 import enum
 
+import internal
+
 
 def correct_tuple(element, tuple_type, length=-1):
-    if not isinstance(element, tuple):
-        return False
-    length = length if length > 0 else len(element)
-    if len(element) != length:
-        return False
-    for i in range(length):
-        if type(element[i]) != tuple_type:
-            return False
-    return True
+    # Positions, sizes and clips of the Layer API are tuples only, unlike the JSON lists of the resources
+    return isinstance(element, tuple) and internal.correct_tuple(element, tuple_type, length)
 
 
 class ClipPosition(enum.Enum):
@@ -33,34 +28,83 @@ class ClipPosition(enum.Enum):
     BOTTOM = 5
 
 
+class ScaleFilter(enum.Enum):
+    NEAREST = 0
+    SMOOTH = 1
+
+
+def is_opaque(surface):
+    """!@brief True when blitting surface replaces every pixel it covers"""
+    return (not surface.get_flags() & pygame.SRCALPHA and surface.get_colorkey() is None and
+            surface.get_alpha() in (None, 255))
+
+
+def uncovered(rect, cover):
+    """!@brief Part of rect outside of cover when it is a single rectangle, rect itself otherwise"""
+    if not rect.colliderect(cover):
+        return rect
+    if cover.left <= rect.left and cover.right >= rect.right:
+        if cover.top <= rect.top:
+            return pygame.Rect(rect.left, min(cover.bottom, rect.bottom), rect.width, max(0, rect.bottom - cover.bottom))
+        if cover.bottom >= rect.bottom:
+            return pygame.Rect(rect.left, rect.top, rect.width, cover.top - rect.top)
+    if cover.top <= rect.top and cover.bottom >= rect.bottom:
+        if cover.left <= rect.left:
+            return pygame.Rect(min(cover.right, rect.right), rect.top, max(0, rect.right - cover.right), rect.height)
+        if cover.right >= rect.right:
+            return pygame.Rect(rect.left, rect.top, cover.left - rect.left, rect.height)
+    return rect
+
+
 class LayerMember:
-    def __init__(self, surface, pos, layer, clip, scale):
-        if not isinstance(surface, pygame.Surface):
-            raise TypeError("surface needs to be a pygame.Surface")
-        if not correct_tuple(pos, int, 2):
-            raise TypeError("pos needs to be (int x, int y)")
-        if not isinstance(layer, int):
-            raise TypeError("layer needs to be an integer")
-        if not correct_tuple(clip, ClipPosition, 2):
-            raise TypeError("clip needs to be (ClipPosition clip_h, ClipPosition clip_v)")
-        if not isinstance(scale, float):
-            raise TypeError("scale needs to be a float")
-        if scale <= 0:
-            raise ValueError("scale needs to have a number strictly highest of 0")
+    # Scaled surface cache statistics of all members
+    scale_hits = 0
+    scale_misses = 0
+
+    def __init__(self, surface, pos, layer, clip, scale, scale_filter=ScaleFilter.NEAREST, opaque=None):
+        if internal.validate:
+            if not isinstance(surface, pygame.Surface):
+                raise TypeError("surface needs to be a pygame.Surface")
+            if not correct_tuple(pos, int, 2):
+                raise TypeError("pos needs to be (int x, int y)")
+            if not isinstance(layer, int):
+                raise TypeError("layer needs to be an integer")
+            if not correct_tuple(clip, ClipPosition, 2):
+                raise TypeError("clip needs to be (ClipPosition clip_h, ClipPosition clip_v)")
+            if not isinstance(scale, float):
+                raise TypeError("scale needs to be a float")
+            if scale <= 0:
+                raise ValueError("scale needs to have a number strictly highest of 0")
+            if not isinstance(scale_filter, ScaleFilter):
+                raise TypeError("scale_filter needs to be a ScaleFilter")
         self.surface = surface
         self.layer = layer
         self.pos = pos
         self.clip = clip
         self.scale = scale
+        self.filter = scale_filter
+        self.visible = True
+        # Incremented each time the surface is changed, the scaled copy is kept as ((version, size, scale, filter), surface)
+        self.version = 0
+        self.scaled = None
+        # Opaque members hide what lies under them, None detects it from the surface format
+        self.declared_opaque = opaque
+        self.opaque = is_opaque(surface) if opaque is None else opaque
 
     def change_surface(self, surface):
-        if not isinstance(surface, pygame.Surface):
-            raise TypeError("surface needs to be a pygame.Surface")
+        if internal.validate:
+            if not isinstance(surface, pygame.Surface):
+                raise TypeError("surface needs to be a pygame.Surface")
         self.surface = surface
+        self.version += 1
+        self.scaled = None
+        if self.declared_opaque is None:
+            self.opaque = is_opaque(surface)
 
     def move(self, new_pos):
-        if not correct_tuple(new_pos, int, 2):
-            raise TypeError("new_pos needs to be (int x, int y)")
+        if internal.validate:
+            if not correct_tuple(new_pos, int, 2):
+                raise TypeError("new_pos needs to be (int x, int y)")
         self.pos = new_pos
 
     def resize(self, scale):
@@ -68,6 +112,27 @@ class LayerMember:
             raise TypeError("scale needs to be a float")
         self.scale = scale
 
+    def set_filter(self, scale_filter):
+        if not isinstance(scale_filter, ScaleFilter):
+            raise TypeError("scale_filter needs to be a ScaleFilter")
+        self.filter = scale_filter
+
+    def get_surface(self):
+        if self.scale == 1:
+            return self.surface
+        size = self.surface.get_size()
+        key = (self.version, size, self.scale, self.filter)
+        if self.scaled is not None and self.scaled[0] == key:
+            LayerMember.scale_hits += 1
+        else:
+            LayerMember.scale_misses += 1
+            scaled_size = (int(size[0] * self.scale), int(size[1] * self.scale))
+            if self.filter == ScaleFilter.SMOOTH:
+                self.scaled = (key, pygame.transform.smoothscale(self.surface, scaled_size))
+            else:
+                self.scaled = (key, pygame.transform.scale(self.surface, scaled_size))
+        return self.scaled[1]
+
     def set_clip(self, clip):
         if not correct_tuple(clip, ClipPosition, 2):
             raise TypeError("clip needs to be (ClipPosition clip_h, ClipPosition clip_v)")
@@ -97,6 +162,10 @@ class LayerMember:
             y = (canvas_size[1] - height) - self.pos[1]
         return int(x), int(y)
 
+    def get_area(self, canvas_size):
+        return pygame.Rect(self.get_position(canvas_size), (int(self.surface.get_width() * self.scale),
+                                                            int(self.surface.get_height() * self.scale)))
+
 
 class Layer(pygame.Surface):
     def __init__(self, canvas_size, layers, default_layer=0):
@@ -118,89 +187,206 @@ class Layer(pygame.Surface):
         self.layer_cnt = layers
         self.layer_show = []
         self.layer_modified = []
+        self.layer_version = []
         self.layer = []
         for i in range(self.layer_cnt):
             self.layer_show.append(True)
             self.layer_modified.append(False)
+            self.layer_version.append(0)
             self.layer.append(pygame.Surface(canvas_size, pygame.HWSURFACE |
                                              pygame.SRCALPHA))
 
+        # Pre-composited image of the unchanged layers [flat_base, flat_depth), the layers under
+        # flat_base are hidden by an opaque layer covering the whole canvas
+        self.flat_cache = pygame.Surface(canvas_size, pygame.HWSURFACE | pygame.SRCALPHA)
+        self.flat_base = 0
+        self.flat_depth = 0
+
         self.default_layer = default_layer
 
-    def add_surface(self, surface, position, layer=-1, clip=(ClipPosition.LEFT, ClipPosition.TOP), zoom=1.0):
-        if not isinstance(surface, pygame.Surface):
-            raise TypeError("surface needs to be a pygame.Surface")
-        if not correct_tuple(position, int, 2):
-            raise TypeError("position needs to be (int x, int y)")
-        if not isinstance(layer, int):
-            raise TypeError("layer needs to be a integer")
+    def add_surface(self, surface, position, layer=-1, clip=(ClipPosition.LEFT, ClipPosition.TOP), zoom=1.0,
+                    scale_filter=ScaleFilter.NEAREST, opaque=None):
+        if internal.validate:
+            if not isinstance(surface, pygame.Surface):
+                raise TypeError("surface needs to be a pygame.Surface")
+            if not correct_tuple(position, int, 2):
+                raise TypeError("position needs to be (int x, int y)")
+            if not isinstance(layer, int):
+                raise TypeError("layer needs to be a integer")
         if layer == -1:
             layer = self.default_layer
-        if layer not in range(self.layer_cnt):
+        if internal.validate and layer not in range(self.layer_cnt):
             raise ValueError("layer needs to be between 0 and layers value")
-        self.surfaces.append(LayerMember(surface, position, layer, clip, zoom))
+        self.surfaces.append(LayerMember(surface, position, layer, clip, zoom, scale_filter, opaque))
         self.layer_modified[layer] = True
         return len(self.surfaces) - 1
 
     def change_surface(self, index, surface):
-        if not isinstance(index, int):
-            raise TypeError("index needs to be a integer")
-        if not isinstance(surface, pygame.Surface):
-            raise TypeError("surface needs to be a pygame.Surface")
-        if index not in range(len(self.surfaces)):
-            raise ValueError("index needs to be a surface list index")
+        if internal.validate:
+            if not isinstance(index, int):
+                raise TypeError("index needs to be a integer")
+            if not isinstance(surface, pygame.Surface):
+                raise TypeError("surface needs to be a pygame.Surface")
+            if index not in range(len(self.surfaces)):
+                raise ValueError("index needs to be a surface list index")
         self.surfaces[index].change_surface(surface)
         self.layer_modified[self.surfaces[index].layer] = True
 
+    def change_scale(self, index, scale, scale_filter=None):
+        if internal.validate:
+            if not isinstance(index, int):
+                raise TypeError("index needs to be an integer")
+            if index not in range(len(self.surfaces)):
+                raise ValueError("index needs to be between 0 and length of surfaces list")
+        self.surfaces[index].resize(scale)
+        if scale_filter is not None:
+            self.surfaces[index].set_filter(scale_filter)
+        self.layer_modified[self.surfaces[index].layer] = True
+
+    def change_member_visibility(self, index, visible=True):
+        if internal.validate:
+            if not isinstance(index, int):
+                raise TypeError("index needs to be an integer")
+            if index not in range(len(self.surfaces)):
+                raise ValueError("index needs to be between 0 and length of surfaces list")
+        self.surfaces[index].visible = visible
+        self.layer_modified[self.surfaces[index].layer] = True
+
     def change_visibility(self, layer, visible=True):
         if not isinstance(layer, int):
             raise TypeError("layer needs to be an integer")
         if layer not in range(self.layer_cnt):
             raise ValueError("layer needs to be between 0 and layer count")
+        if self.layer_show[layer] != visible and self.flat_base <= layer < self.flat_depth:
+            self.flat_depth = self.flat_base
         self.layer_show[layer] = visible
 
+    def get_covers(self):
+        """!@brief Areas of each layer covered by opaque members"""
+        size = self.get_size()
+        covers = [[] for i in range(self.layer_cnt)]
+        for j in self.surfaces:
+            if j.opaque and j.visible:
+                covers[j.layer].append(j.get_area(size))
+        return covers
+
+    def get_base_layer(self, covers=None):
+        """!@brief Lowest layer to draw, the layers under it are hidden by an opaque full canvas member"""
+        if covers is None:
+            covers = self.get_covers()
+        canvas = pygame.Rect((0, 0), self.get_size())
+        for i in range(self.layer_cnt - 1, 0, -1):
+            if self.layer_show[i] and any(j.contains(canvas) for j in covers[i]):
+                return i
+        return 0
+
+    def get_visible_area(self, layer, covers):
+        area = pygame.Rect((0, 0), self.get_size())
+        for i in range(layer + 1, self.layer_cnt):
+            if self.layer_show[i]:
+                for j in covers[i]:
+                    area = uncovered(area, j)
+        return area
+
     def refresh(self):
-        self.fill(pygame.Color(0, 0, 0, 0))
-        for i in range(self.layer_cnt):
+        covers = self.get_covers()
+        base = self.get_base_layer(covers)
+        if base != self.flat_base:
+            self.flat_base = base
+            self.flat_depth = base
+
+        dirty = self.layer_cnt
+        for i in range(base, self.layer_cnt):
+            if self.layer_show[i] and self.layer_modified[i]:
+                dirty = i
+                break
+
+        # Layers can't be removed from the flattened cache, rebuild it from the base layer
+        if dirty < self.flat_depth:
+            self.flat_depth = base
+
+        # Flatten the contiguous unchanged layers lying below the lowest modified one
+        if self.flat_depth < dirty < self.layer_cnt:
+            if self.flat_depth == base:
+                self.flat_cache.fill(pygame.Color(0, 0, 0, 0))
+            batch = []
+            for i in range(self.flat_depth, dirty):
+                if self.layer_show[i]:
+                    self.update_layer(i)
+                    batch.append((self.layer[i], (0, 0)))
+            self.flat_cache.blits(batch, doreturn=False)
+            self.flat_depth = dirty
+
+        # Each layer is only copied where the opaque layers above it leave it visible
+        batch = []
+        for i in range(self.layer_cnt - 1, self.flat_depth - 1, -1):
             if self.layer_show[i]:
-                self.update_layer(i)
-                self.blit(self.layer[i], (0, 0))
+                area = self.get_visible_area(i, covers)
+                if area:
+                    self.update_layer(i)
+                    batch.append((self.layer[i], area.topleft, area))
+        if self.flat_depth > base:
+            area = self.get_visible_area(self.flat_depth - 1, covers)
+            if area:
+                # Additive blit on a cleared surface copies the cache without blending it twice
+                batch.append((self.flat_cache, area.topleft, area, pygame.BLEND_RGBA_ADD))
+        batch.reverse()
+        self.fill(pygame.Color(0, 0, 0, 0))
+        self.blits(batch, doreturn=False)
 
     def update_layer(self, layer):
-        if not isinstance(layer, int):
-            raise TypeError("layer needs to be an integer")
-        if layer not in range(self.layer_cnt):
-            raise ValueError("layer needs to be between 0 and layer count")
+        if internal.validate:
+            if not isinstance(layer, int):
+                raise TypeError("layer needs to be an integer")
+            if layer not in range(self.layer_cnt):
+                raise ValueError("layer needs to be between 0 and layer count")
         if self.layer_modified[layer]:
+            if self.flat_base <= layer < self.flat_depth:
+                self.flat_depth = self.flat_base
+            size = self.get_size()
+            canvas = pygame.Rect((0, 0), size)
+            # Members are walked from the top, the ones hidden by an opaque member above are
+            # skipped and the partially hidden ones only copy their visible part
+            batch = []
+            covers = []
+            for j in reversed(self.surfaces):
+                if j.layer != layer or not j.visible:
+                    continue
+                rect = j.get_area(size)
+                area = rect.clip(canvas)
+                for cover in covers:
+                    area = uncovered(area, cover)
+                if not area:
+                    continue
+                batch.append((j.get_surface(), area.topleft, area.move(-rect.x, -rect.y)))
+                if j.opaque:
+                    covers.append(rect)
+            batch.reverse()
             self.layer[layer].fill(pygame.Color(0, 0, 0, 0))
-            for j in self.surfaces:
-                if j.layer == layer:
-                    pos = j.get_position(self.get_size())
-                    surf = j.surface
-                    if j.scale != 1:
-                        surf = pygame.transform.scale(surf, (
-                            int(surf.get_width() * j.scale), int(surf.get_height() * j.scale)))
-                    self.layer[layer].blit(surf, pos)
+            self.layer[layer].blits(batch, doreturn=False)
             self.layer_modified[layer] = False
+            self.layer_version[layer] += 1
 
     def relative_move(self, index, pos):
-        if not isinstance(index, int):
-            raise TypeError("index needs to be an integer")
-        if not correct_tuple(pos, int, 2):
-            raise TypeError("pos needs to be (int x, int y)")
-        if index not in range(len(self.surfaces)):
-            raise ValueError("index needs to be between 0 and length of surfaces list")
+        if internal.validate:
+            if not isinstance(index, int):
+                raise TypeError("index needs to be an integer")
+            if not correct_tuple(pos, int, 2):
+                raise TypeError("pos needs to be (int x, int y)")
+            if index not in range(len(self.surfaces)):
+                raise ValueError("index needs to be between 0 and length of surfaces list")
         self.surfaces[index].pos = (self.surfaces[index].pos[0] + pos[0],
                                     self.surfaces[index].pos[1] + pos[1])
         self.layer_modified[self.surfaces[index].layer] = True
 
     def absolute_move(self, index, pos):
-        if not isinstance(index, int):
-            raise TypeError("index needs to be an integer")
-        if not correct_tuple(pos, int, 2):
-            raise TypeError("pos needs to be (int x, int y)")
-        if index not in range(len(self.surfaces)):
-            raise ValueError("index needs to be between 0 and length of surfaces list")
+        if internal.validate:
+            if not isinstance(index, int):
+                raise TypeError("index needs to be an integer")
+            if not correct_tuple(pos, int, 2):
+                raise TypeError("pos needs to be (int x, int y)")
+            if index not in range(len(self.surfaces)):
+                raise ValueError("index needs to be between 0 and length of surfaces list")
         self.surfaces[index].pos = pos
         self.layer_modified[self.surfaces[index].layer] = True
 
@@ -221,11 +407,15 @@ class Layer(pygame.Surface):
             raise TypeError("size needs to be (int width, int height)")
         if size[0] <= 0 or size[1] <= 0:
             raise ValueError("size needs to have content upper to (0,0)")
+        if tuple(size) == self.get_size():
+            return
         pygame.Surface.__init__(self, size, pygame.HWSURFACE |
                                 pygame.SRCALPHA)
         for i in range(self.layer_cnt):
             self.layer_modified[i] = True
             self.layer[i] = pygame.Surface(size, pygame.HWSURFACE | pygame.SRCALPHA)
+        self.flat_cache = pygame.Surface(size, pygame.HWSURFACE | pygame.SRCALPHA)
+        self.flat_depth = self.flat_base
 
     def get_rect(self, index):
         if index not in range(self.layer_cnt):
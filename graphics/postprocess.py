@@ -0,0 +1,76 @@
+################################################################################
+# Filename: graphics/postprocess.py                                            #
+# Created by: Venceslas Duet                                                   #
+# Created at: 10-19-2026                                                       #
+# Last update at: 10-19-2026                                                   #
+# Description: CRT look (scanlines, shadow mask and vignette) applied to the   #
+# presented frame                                                              #
+# Licence: None                                                                #
+################################################################################
+
+import pygame
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class CRTEffect:
+    """!@brief Darkens the presented frame with a scanline, aperture grille and vignette mask
+
+    The three effects are folded into one RGB mask surface computed with NumPy once per output size,
+    then each frame costs a single multiplicative blit (SIMD in SDL) over the presented frame.
+
+    @param scanlines Darkening between two canvas rows (0 to 1)
+    @param shadow_mask Darkening of the two other channels of each grille column (0 to 1)
+    @param vignette Darkening of the corners (0 to 1)
+    """
+
+    # Number of masks kept for the last output sizes
+    CACHE_SIZE = 2
+
+    def __init__(self, scanlines=0.35, shadow_mask=0.2, vignette=0.35):
+        if numpy is None:
+            raise pygame.error("numpy is needed by the CRT effect")
+        for i in (scanlines, shadow_mask, vignette):
+            if not isinstance(i, (int, float)) or not 0 <= i <= 1:
+                raise ValueError("effect strengths need to be between 0 and 1")
+        self.scanlines = scanlines
+        self.shadow_mask = shadow_mask
+        self.vignette = vignette
+        self.masks = {}
+
+    def build_mask(self, size, source_size):
+        width, height = size
+        # One scanline per canvas row, darkest on the row boundaries
+        phase = (numpy.arange(height, dtype=numpy.float32) + 0.5) * source_size[1] / height % 1.0
+        rows = 1.0 - self.scanlines * (0.5 + 0.5 * numpy.cos(2 * numpy.pi * phase))
+
+        grille = numpy.full((width, 3), 1.0 - self.shadow_mask, dtype=numpy.float32)
+        grille[numpy.arange(width), numpy.arange(width) % 3] = 1.0
+
+        x = numpy.linspace(-1.0, 1.0, width, dtype=numpy.float32)
+        y = numpy.linspace(-1.0, 1.0, height, dtype=numpy.float32)
+        corners = numpy.clip(1.0 - self.vignette * 0.5 * (x[:, None] ** 2 + y[None, :] ** 2), 0.0, 1.0)
+
+        values = grille[:, None, :] * (rows[None, :] * corners)[:, :, None]
+        mask = pygame.Surface(size)
+        pygame.surfarray.blit_array(mask, (values * 255 + 0.5).astype(numpy.uint8))
+        return mask
+
+    def get_mask(self, size, source_size):
+        key = (size, source_size)
+        if key not in self.masks:
+            if len(self.masks) >= CRTEffect.CACHE_SIZE:
+                del self.masks[next(iter(self.masks))]
+            self.masks[key] = self.build_mask(size, source_size)
+        return self.masks[key]
+
+    def apply(self, surface, source_size=None):
+        """!@brief Applies the effect in place
+
+        @param source_size Size of the canvas scaled to surface, used to align the scanlines
+        """
+        size = surface.get_size()
+        surface.blit(self.get_mask(size, source_size or size), (0, 0), None, pygame.BLEND_RGB_MULT)
@@ -0,0 +1,130 @@
+################################################################################
+# Filename: graphics/presenter.py                                              #
+# Created by: Venceslas Duet                                                   #
+# Created at: 10-19-2026                                                       #
+# Last update at: 10-19-2026                                                   #
+# Description: Presentation backends showing a Layer canvas on the window,     #
+# either with software surfaces or with SDL 2 renderer textures                #
+# Licence: None                                                                #
+################################################################################
+
+import pygame
+
+try:
+    from pygame._sdl2 import video
+except ImportError:
+    video = None
+
+
+class SurfacePresenter:
+    """!@brief Composites the canvas in software and upscales it on the display surface"""
+
+    # The canvas surface holds the presented image after present()
+    composites_canvas = True
+
+    def __init__(self):
+        self.window = None
+        # Optional effect applied in place on the window surface before the flip
+        self.post_process = None
+
+    def open(self, size, title):
+        self.window = pygame.display.set_mode(size, pygame.RESIZABLE)
+        pygame.display.set_caption(title)
+
+    def set_icon(self, icon):
+        pygame.display.set_icon(icon)
+
+    def present(self, canvas):
+        canvas.refresh()
+        # The display surface follows the window when it is resized
+        self.window = pygame.display.get_surface()
+        to_render = canvas
+        if canvas.get_size() != self.window.get_size():
+            to_render = pygame.transform.scale(canvas, self.window.get_size())
+        self.window.blit(to_render, (0, 0))
+        if self.post_process is not None:
+            self.post_process.apply(self.window, canvas.get_size())
+        pygame.display.flip()
+
+    def close(self):
+        self.window = None
+
+
+class TexturePresenter:
+    """!@brief Uploads each canvas layer as a texture and lets the renderer compose and scale them
+
+    Layer buffers are only uploaded again when their content changed, so static layers cost one
+    texture copy on the GPU per frame and no CPU scaling pass is done.
+
+    @param software Forces the SDL software renderer (usable with the dummy video driver)
+    """
+
+    composites_canvas = False
+
+    def __init__(self, software=False):
+        if video is None:
+            raise pygame.error("pygame._sdl2.video is unavailable")
+        self.software = software
+        self.window = None
+        self.renderer = None
+        self.canvas = None
+        self.textures = {}
+
+    def open(self, size, title):
+        if self.window is None:
+            self.window = video.Window(title, size, position=video.WINDOWPOS_CENTERED, resizable=True)
+            self.renderer = video.Renderer(self.window, accelerated=0 if self.software else -1)
+            self.renderer.draw_color = (0, 0, 0, 255)
+        else:
+            self.window.size = size
+            self.window.title = title
+
+    def set_icon(self, icon):
+        self.window.set_icon(icon)
+
+    def upload(self, key, surface, version):
+        entry = self.textures.get(key)
+        if entry is not None and entry[1] == version:
+            return entry[0]
+        texture = entry[0] if entry is not None else None
+        if texture is None or (texture.width, texture.height) != surface.get_size():
+            texture = video.Texture.from_surface(self.renderer, surface)
+            texture.blend_mode = pygame.BLENDMODE_BLEND
+        else:
+            texture.update(surface)
+        self.textures[key] = (texture, version)
+        return texture
+
+    def present(self, canvas):
+        if canvas is not self.canvas:
+            # Layer versions are only meaningful for the canvas they come from
+            self.canvas = canvas
+            self.textures = {}
+        if self.renderer.logical_size != canvas.get_size():
+            self.renderer.logical_size = canvas.get_size()
+        self.renderer.clear()
+        # Layers hidden by an opaque full canvas layer are neither rendered nor uploaded
+        for i in range(canvas.get_base_layer(), canvas.layer_cnt):
+            if canvas.layer_show[i]:
+                canvas.update_layer(i)
+                self.upload(i, canvas.layer[i], canvas.layer_version[i]).draw()
+        self.renderer.present()
+
+    def close(self):
+        self.canvas = None
+        self.textures = {}
+        self.renderer = None
+        self.window = None
+
+
+def create_presenter(mode):
+    """!@brief Creates the presenter for the given mode, falling back to software surfaces
+
+    @param mode "surface", "texture" or "software" (texture backend with the software renderer)
+    """
+    if mode in ("texture", "software"):
+        try:
+            return TexturePresenter(mode == "software")
+        except pygame.error:
+            pass
+    return SurfacePresenter()
@@ -2,18 +2,23 @@
 # Filename: graphics/text.py                                                   #
 # Created by: Venceslas Duet                                                   #
 # Created at: 03-27-2018                                                       #
-# Last update at: 03-15-2022                                                   #
+# Last update at: 10-19-2026                                                   #
 # Description: High level class for create surface from string                 #
 # Licence: None                                                                #
 ################################################################################
 
+import collections
+
 import pygame
 
 import internal
 
 
 class Text:
-    def __init__(self, font, letter_size):
+    # Number of wrapped layouts kept in cache per font
+    LAYOUT_CACHE_SIZE = 256
+
+    def __init__(self, font, letter_size, proportional=False, spacing=1):
         if not isinstance(font, pygame.Surface):
             raise TypeError("font needs to be a pygame.Surface")
         if not internal.correct_tuple(letter_size, int, 2):
@@ -21,40 +26,154 @@ class Text:
         if (font.get_width() % letter_size[0] != 0 or
                 font.get_height() % letter_size[1] != 0):
             raise TypeError("font must have size proportional size of letter_size")
+        if not isinstance(proportional, bool):
+            raise TypeError("proportional needs to be a boolean")
+        if not isinstance(spacing, int):
+            raise TypeError("spacing needs to be a integer")
         self.font = font
         self.canvas = letter_size
         self.nb_x = font.get_width() // letter_size[0]
         self.nb_y = font.get_height() // letter_size[1]
         self.color = None
+        self.proportional = proportional
+        self.spacing = spacing
+        self.fallback = ord("?") if ord("?") < self.nb_x * self.nb_y else 0
 
-    def gen_text(self, text):
+        # Glyph metrics: bounding box inside the cell, area drawn from the font sheet and advance width
+        self.glyph_bounds = []
+        self.glyph_areas = []
+        self.advances = []
+        self.compute_metrics()
+
+        self.layout_cache = collections.OrderedDict()
+        self.layout_hits = 0
+        self.layout_misses = 0
+
+    def compute_metrics(self):
+        for letter_id in range(self.nb_x * self.nb_y):
+            cell = pygame.Rect((letter_id % self.nb_x) * self.canvas[0], (letter_id // self.nb_x) * self.canvas[1],
+                               self.canvas[0], self.canvas[1])
+            rects = pygame.mask.from_surface(self.font.subsurface(cell)).get_bounding_rects()
+            bounds = rects[0].unionall(rects[1:]) if rects else None
+            if not self.proportional:
+                area = cell
+                advance = self.canvas[0]
+            elif bounds is not None:
+                area = pygame.Rect(cell.x + bounds.x, cell.y, bounds.width, self.canvas[1])
+                advance = bounds.width + self.spacing
+            else:
+                # Blank glyphs (space) keep half of the cell
+                area = pygame.Rect(cell.x, cell.y, self.canvas[0] // 2, self.canvas[1])
+                advance = self.canvas[0] // 2
+            self.glyph_bounds.append(bounds)
+            self.glyph_areas.append(area)
+            self.advances.append(advance)
+
+    def glyph(self, char):
+        letter_id = ord(char)
+        if letter_id >= len(self.advances):
+            return self.fallback
+        return letter_id
+
+    def line_width(self, line):
+        width = 0
+        for i in line:
+            width += self.advances[self.glyph(i)]
+        # No spacing after the last glyph
+        if self.proportional and width > 0:
+            width -= self.spacing
+        return width
+
+    def measure(self, text):
+        if not isinstance(text, str):
+            raise TypeError("text needs to be a string")
+        lines = text.split("\n")
+        return max(self.line_width(i) for i in lines), len(lines) * self.canvas[1]
+
+    def wrap(self, text, width):
         if not isinstance(text, str):
             raise TypeError("text needs to be a string")
-        bts = []
-        nl = 0
-        actual = 0
-        maximum = 0
+        if not isinstance(width, int):
+            raise TypeError("width needs to be a integer")
+        key = (text, width)
+        if key in self.layout_cache:
+            self.layout_hits += 1
+            self.layout_cache.move_to_end(key)
+            return self.layout_cache[key]
+        self.layout_misses += 1
+
+        trailing = self.spacing if self.proportional else 0
+        space = self.advances[self.glyph(" ")]
+        lines = []
+        for paragraph in text.split("\n"):
+            line = ""
+            line_width = 0
+            for word in paragraph.split(" "):
+                word_width = sum(self.advances[self.glyph(i)] for i in word)
+                if line and line_width + space + word_width - trailing <= width:
+                    line = line + " " + word
+                    line_width += space + word_width
+                    continue
+                if line:
+                    lines.append(line)
+                line = ""
+                line_width = 0
+                # Words longer than a line are broken between letters
+                for i in word:
+                    advance = self.advances[self.glyph(i)]
+                    if line and line_width + advance - trailing > width:
+                        lines.append(line)
+                        line = ""
+                        line_width = 0
+                    line = line + i
+                    line_width += advance
+            lines.append(line)
+
+        lines = tuple(lines)
+        self.layout_cache[key] = lines
+        if len(self.layout_cache) > Text.LAYOUT_CACHE_SIZE:
+            self.layout_cache.popitem(last=False)
+        return lines
+
+    def truncate(self, text, width, ellipsis="..."):
+        if not isinstance(text, str):
+            raise TypeError("text needs to be a string")
+        if self.line_width(text) <= width:
+            return text
+        trailing = self.spacing if self.proportional else 0
+        available = width - sum(self.advances[self.glyph(i)] for i in ellipsis) + trailing
+        if available < 0:
+            return ""
+        line_width = 0
+        end = 0
         for i in text:
-            if i == "\n":
-                nl = nl + 1
-                maximum = max(maximum, actual)
-                actual = 0
-            else:
-                actual = actual + 1
-            bts.append(ord(i))
-        maximum = max(maximum, actual)
-        ret = pygame.Surface((maximum * self.canvas[0], (nl + 1) * self.canvas[1]),
-                             pygame.HWSURFACE | pygame.SRCALPHA)
-        current = 0
-        line = 0
+            advance = self.advances[self.glyph(i)]
+            if line_width + advance > available:
+                break
+            line_width += advance
+            end += 1
+        return text[:end].rstrip() + ellipsis
+
+    def layout(self, text, width, max_lines=0):
+        lines = self.wrap(text, width)
+        if 0 < max_lines < len(lines):
+            lines = lines[:max_lines - 1] + (self.truncate(" ".join(lines[max_lines - 1:]), width),)
+        return lines
+
+    def gen_text(self, text):
+        if not isinstance(text, str):
+            raise TypeError("text needs to be a string")
+        ret = pygame.Surface(self.measure(text), pygame.HWSURFACE | pygame.SRCALPHA)
+        x = 0
+        y = 0
         for i in text:
             if i == "\n":
-                line = line + 1
-                current = 0
+                y += self.canvas[1]
+                x = 0
             else:
-                ret.blit(self.gen_letter(ord(i)), (current * self.canvas[0],
-                                                   line * self.canvas[1]))
-                current += 1
+                letter_id = self.glyph(i)
+                ret.blit(self.font, (x, y), self.glyph_areas[letter_id])
+                x += self.advances[letter_id]
 
         if self.color is not None:
             ret.fill(self.color, None, pygame.BLEND_RGB_MIN)
@@ -62,10 +181,11 @@ class Text:
         return ret
 
     def gen_letter(self, letter_id):
-        if not isinstance(letter_id, int):
-            raise TypeError("letter_id needs to be a integer")
-        if letter_id < 0 or letter_id >= (self.nb_x * self.nb_y):
-            raise TypeError("letter_id needs to have value between 0 and", (self.nb_x * self.nb_y))
+        if internal.validate:
+            if not isinstance(letter_id, int):
+                raise TypeError("letter_id needs to be a integer")
+            if letter_id < 0 or letter_id >= (self.nb_x * self.nb_y):
+                raise TypeError("letter_id needs to have value between 0 and", (self.nb_x * self.nb_y))
         pos_x = letter_id % self.nb_x
         pos_y = letter_id // self.nb_x
         ret = pygame.Surface(self.canvas, pygame.HWSURFACE | pygame.SRCALPHA)
@@ -78,4 +198,46 @@ class Text:
         self.color = color
 
     def clone(self):
-        return Text(self.font, self.canvas)
+        return Text(self.font, self.canvas, self.proportional, self.spacing)
+
+
+class CellText(pygame.Surface):
+    def __init__(self, font, columns, rows=1):
+        if not isinstance(font, Text):
+            raise TypeError("font needs to be a Text")
+        if not isinstance(columns, int) or not isinstance(rows, int):
+            raise TypeError("columns and rows need to be integers")
+        if columns <= 0 or rows <= 0:
+            raise ValueError("columns and rows need to be upper to 0")
+        self.font = font
+        self.columns = columns
+        self.rows = rows
+        # Letter shown in each cell, None when the cell has never been drawn
+        self.cells = [[None] * columns for i in range(rows)]
+        pygame.Surface.__init__(self, (columns * font.canvas[0], rows * font.canvas[1]),
+                                pygame.HWSURFACE | pygame.SRCALPHA)
+
+    def set_text(self, text):
+        if not isinstance(text, str):
+            raise TypeError("text needs to be a string")
+        width, height = self.font.canvas
+        lines = text.split("\n")
+        damage = []
+        for row in range(self.rows):
+            line = lines[row] if row < len(lines) else ""
+            for column in range(self.columns):
+                letter_id = self.font.glyph(line[column] if column < len(line) else " ")
+                if self.cells[row][column] == letter_id:
+                    continue
+                self.cells[row][column] = letter_id
+                rect = pygame.Rect(column * width, row * height, width, height)
+                self.fill(pygame.Color(0, 0, 0, 0), rect)
+                self.blit(self.font.font, rect, ((letter_id % self.font.nb_x) * width,
+                                                 (letter_id // self.font.nb_x) * height, width, height))
+                if self.font.color is not None:
+                    self.fill(self.font.color, rect, pygame.BLEND_RGB_MIN)
+                damage.append(rect)
+        return damage
+
+    def invalidate(self):
+        self.cells = [[None] * self.columns for i in range(self.rows)]
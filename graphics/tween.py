@@ -0,0 +1,135 @@
+################################################################################
+# Filename: graphics/tween.py                                                  #
+# Created by: Venceslas Duet                                                   #
+# Created at: 10-19-2026                                                       #
+# Last update at: 10-19-2026                                                   #
+# Description: Fixed timestep tweening of Layer members position, scale and    #
+# visibility                                                                   #
+# Licence: None                                                                #
+################################################################################
+
+import math
+import time
+
+
+def linear(t):
+    return t
+
+
+def ease_in(t):
+    return t * t
+
+
+def ease_out(t):
+    return t * (2 - t)
+
+
+def ease_in_out(t):
+    return 2 * t * t if t < 0.5 else -1 + (4 - 2 * t) * t
+
+
+def ease_out_cubic(t):
+    return 1 - (1 - t) ** 3
+
+
+class Tween:
+    def __init__(self, layer, index, prop, start, end, duration, easing=ease_in_out):
+        if prop not in ["pos", "scale", "visible"]:
+            raise ValueError("prop needs to be pos, scale or visible")
+        if duration < 0:
+            raise ValueError("duration needs to be positive")
+        self.layer = layer
+        self.index = index
+        self.prop = prop
+        self.start = start
+        self.end = end
+        self.duration = duration
+        self.easing = easing
+        self.elapsed = 0.0
+
+    def is_finished(self):
+        return self.elapsed >= self.duration
+
+    def value(self):
+        if self.prop == "visible":
+            return self.end if self.is_finished() else self.start
+        progress = self.easing(1.0 if self.is_finished() else self.elapsed / self.duration)
+        if self.prop == "pos":
+            return (int(round(self.start[0] + (self.end[0] - self.start[0]) * progress)),
+                    int(round(self.start[1] + (self.end[1] - self.start[1]) * progress)))
+        return float(self.start + (self.end - self.start) * progress)
+
+
+class Tweener:
+    """!@brief Advances tweens on a fixed timestep and invalidates each touched layer once per update
+
+    @param time_source Function returning the current time in seconds
+    @param step Duration of a simulation step in seconds
+    """
+
+    def __init__(self, time_source=time.perf_counter, step=1 / 60):
+        self.time_source = time_source
+        self.step = step
+        self.tweens = []
+        self.last = None
+        self.accumulator = 0.0
+
+    def add(self, tween):
+        # A member property is driven by a single tween at a time
+        self.tweens = [i for i in self.tweens
+                       if not (i.layer is tween.layer and i.index == tween.index and i.prop == tween.prop)]
+        self.tweens.append(tween)
+        if self.last is None:
+            self.last = self.time_source()
+            self.accumulator = 0.0
+        return tween
+
+    def move(self, layer, index, pos, duration, easing=ease_in_out):
+        return self.add(Tween(layer, index, "pos", layer.surfaces[index].pos, pos, duration, easing))
+
+    def zoom(self, layer, index, scale, duration, easing=ease_in_out):
+        return self.add(Tween(layer, index, "scale", layer.surfaces[index].scale, scale, duration, easing))
+
+    def show(self, layer, index, visible=True, delay=0.0):
+        return self.add(Tween(layer, index, "visible", layer.surfaces[index].visible, visible, delay, linear))
+
+    def cancel(self, layer, index):
+        self.tweens = [i for i in self.tweens if not (i.layer is layer and i.index == index)]
+
+    def is_active(self):
+        return len(self.tweens) > 0
+
+    def next_delay(self):
+        """!@brief Milliseconds until the next step is due, at least 1 (pygame waits forever on 0)"""
+        if not self.tweens:
+            return None
+        pending = self.accumulator
+        if self.last is not None:
+            pending += self.time_source() - self.last
+        return max(1, math.ceil((self.step - pending) * 1000))
+
+    def update(self):
+        if not self.tweens:
+            self.last = None
+            return False
+        now = self.time_source()
+        self.accumulator += now - self.last
+        self.last = now
+        steps = int(self.accumulator / self.step)
+        if steps == 0:
+            return False
+        self.accumulator -= steps * self.step
+
+        modified = {}
+        for tween in self.tweens:
+            tween.elapsed += steps * self.step
+            member = tween.layer.surfaces[tween.index]
+            setattr(member, tween.prop, tween.value())
+            modified[(id(tween.layer), member.layer)] = (tween.layer, member.layer)
+        for layer, index in modified.values():
+            layer.layer_modified[index] = True
+
+        self.tweens = [i for i in self.tweens if not i.is_finished()]
+        if not self.tweens:
+            self.last = None
+        return True
@@ -2,19 +2,27 @@
 # Filename: internal.py                                                        #
 # Created by: Venceslas Duet                                                   #
 # Created at: 04-05-2018                                                       #
-# Last update at: 03-15-2022                                                   #
+# Last update at: 10-19-2026                                                   #
 # Description: Collection of check functions                                   #
 # Licence: None                                                                #
 ################################################################################
 
+# Argument checks of the graphics hot paths are skipped when False (release mode).
+# Follows python -O by default
+validate = __debug__
+
+
+def set_validation(enabled):
+    global validate
+    validate = enabled
+
+
 def correct_tuple(element, tuple_type, length=-1):
-    if not (isinstance(element, tuple) or
-            isinstance(element, list)):
+    if not isinstance(element, (tuple, list)):
         return False
-    length = length if length > 0 else len(element)
-    if len(element) != length:
+    if length > 0 and len(element) != length:
         return False
-    for i in range(length):
-        if type(element[i]) != tuple_type:
+    for i in element:
+        if type(i) is not tuple_type:
             return False
     return True
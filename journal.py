@@ -0,0 +1,152 @@
+################################################################################
+# Filename: journal.py                                                         #
+# Created by: Venceslas Duet                                                   #
+# Created at: 10-19-2026                                                       #
+# Last update at: 10-19-2026                                                   #
+# Description: Crash-safe persistence of the launcher settings in an           #
+# append-only journal                                                          #
+# Licence: None                                                                #
+################################################################################
+
+import json
+import os
+import queue
+import threading
+import zlib
+
+
+def apply_record(state, record):
+    match record["op"]:
+        case "setting":
+            state["settings"][record["key"]] = record["value"]
+        case "clear_settings":
+            state["settings"] = {}
+
+
+def empty_state():
+    return {"settings": {}}
+
+
+def encode_record(record):
+    payload = json.dumps(record, separators=(",", ":")).encode()
+    return b"%08x " % zlib.crc32(payload) + payload + b"\n"
+
+
+class StateJournal:
+    """!@brief Launcher state kept as a snapshot plus an append-only journal of the changes since it
+
+    Changes are applied in memory at once and written by a background thread, one checksummed
+    line per record, synced after each batch. A torn or corrupted tail is dropped at load, so a
+    power cut loses at most the record being written. The journal is folded into a new snapshot,
+    atomically replaced, every COMPACT_RECORDS records; records carry a sequence number so a crash
+    between the snapshot and the journal truncation never applies a record twice.
+    """
+
+    COMPACT_RECORDS = 1000
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.snapshot_path = os.path.join(directory, "state.json")
+        self.journal_path = os.path.join(directory, "state.journal")
+        self.state = empty_state()
+        self.sequence = 0
+        self.records = 0
+        self.load()
+
+        # The writer thread keeps its own copy of the state to build the snapshots
+        self.written = json.loads(json.dumps(self.state))
+        self.written_sequence = self.sequence
+        self.queue = queue.Queue()
+        self.file = open(self.journal_path, "ab")
+        self.thread = threading.Thread(target=self.write_records, name="journal", daemon=True)
+        self.thread.start()
+
+    def load(self):
+        if os.path.isfile(self.snapshot_path):
+            with open(self.snapshot_path, "r") as file:
+                data = json.load(file)
+            self.state = data["state"]
+            self.sequence = data["sequence"]
+        if not os.path.isfile(self.journal_path):
+            return
+        with open(self.journal_path, "rb") as file:
+            data = file.read()
+        valid = 0
+        while valid < len(data):
+            end = data.find(b"\n", valid)
+            if end < 0:
+                break
+            line = data[valid:end]
+            try:
+                checksum, payload = line.split(b" ", 1)
+                if int(checksum, 16) != zlib.crc32(payload):
+                    break
+                record = json.loads(payload)
+            except ValueError:
+                break
+            if record["seq"] > self.sequence:
+                apply_record(self.state, record)
+                self.sequence = record["seq"]
+            self.records += 1
+            valid = end + 1
+        if valid < len(data):
+            # Torn write from a power cut, the next records are appended after the last valid one
+            with open(self.journal_path, "r+b") as file:
+                file.truncate(valid)
+
+    def append(self, record):
+        self.sequence += 1
+        record["seq"] = self.sequence
+        apply_record(self.state, record)
+        self.queue.put(record)
+
+    def set_setting(self, key, value):
+        if self.state["settings"].get(key) != value:
+            self.append({"op": "setting", "key": key, "value": value})
+
+    def clear_settings(self):
+        if self.state["settings"]:
+            self.append({"op": "clear_settings"})
+
+    def get_settings(self):
+        return dict(self.state["settings"])
+
+    def write_records(self):
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            while not self.queue.empty():
+                batch.append(self.queue.get())
+            records = [i for i in batch if i is not None]
+            running = len(records) == len(batch)
+
+            for record in records:
+                self.file.write(encode_record(record))
+                apply_record(self.written, record)
+                self.written_sequence = record["seq"]
+            if records:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+                self.records += len(records)
+            if self.records >= StateJournal.COMPACT_RECORDS or (not running and self.records):
+                self.compact()
+        self.file.close()
+
+    def compact(self):
+        path = self.snapshot_path + ".tmp"
+        with open(path, "w") as file:
+            json.dump({"sequence": self.written_sequence, "state": self.written}, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(path, self.snapshot_path)
+        if os.name != "nt":
+            directory = os.open(self.directory, os.O_RDONLY)
+            os.fsync(directory)
+            os.close(directory)
+        self.file.truncate(0)
+        self.records = 0
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
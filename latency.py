@@ -0,0 +1,102 @@
+################################################################################
+# Filename: latency.py                                                         #
+# Created by: Venceslas Duet                                                   #
+# Created at: 10-19-2026                                                       #
+# Last update at: 10-19-2026                                                   #
+# Description: Input-to-photon latency measurement                             #
+# Licence: None                                                                #
+################################################################################
+
+import collections
+import time
+
+import pygame
+
+
+class LatencyMonitor:
+    """!@brief Measures the time between an input event arrival and the presentation of its frame
+
+    The SDL queue is drained while frames are built (pump), so events arriving during a render are
+    stamped then rather than when the launcher gets to them. Events are resolved when the frame
+    of the iteration handling them is presented (after the buffer swap); events whose iteration
+    presents nothing had no visible effect and are dropped.
+    """
+
+    INPUT_EVENTS = {
+        pygame.KEYDOWN, pygame.KEYUP,
+        pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL,
+        pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP, pygame.JOYAXISMOTION, pygame.JOYHATMOTION,
+        pygame.CONTROLLERBUTTONDOWN, pygame.CONTROLLERBUTTONUP, pygame.CONTROLLERAXISMOTION
+    }
+
+    # Upper bounds of the histogram buckets in milliseconds (the last one catches everything)
+    BUCKETS = (1.0, 2.0, 4.0, 8.0, 16.7, 33.3, 50.0, 100.0, 250.0, 500.0, 1000.0, float("inf"))
+
+    def __init__(self, samples=1024):
+        self.pending = []
+        # Events taken from the SDL queue before their handling, and arrival time of the inputs
+        self.queued = []
+        self.arrivals = {}
+        self.counts = [0] * len(LatencyMonitor.BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.samples = collections.deque(maxlen=samples)
+
+    def pump(self, events):
+        now = time.perf_counter()
+        for event in events:
+            self.queued.append(event)
+            if event.type in LatencyMonitor.INPUT_EVENTS:
+                self.arrivals[id(event)] = now
+
+    def take(self):
+        events = self.queued
+        self.queued = []
+        return events
+
+    def stamp(self, events):
+        now = time.perf_counter()
+        for event in events:
+            if event.type in LatencyMonitor.INPUT_EVENTS:
+                self.pending.append(self.arrivals.pop(id(event), now))
+
+    def presented(self):
+        if not self.pending:
+            return
+        now = time.perf_counter()
+        for arrival in self.pending:
+            self.add((now - arrival) * 1000)
+        self.pending = []
+
+    def drop_pending(self):
+        self.pending = []
+
+    def add(self, latency):
+        for i in range(len(LatencyMonitor.BUCKETS)):
+            if latency <= LatencyMonitor.BUCKETS[i]:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.total += latency
+        self.maximum = max(self.maximum, latency)
+        self.samples.append(latency)
+
+    def histogram(self):
+        return list(zip(LatencyMonitor.BUCKETS, self.counts))
+
+    def mean(self):
+        return self.total / self.count if self.count > 0 else 0.0
+
+    def percentile(self, percent):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+    def report(self):
+        lines = ["input latency: {} events, mean {:.2f} ms, p99 {:.2f} ms, max {:.2f} ms".format(
+            self.count, self.mean(), self.percentile(99), self.maximum)]
+        for bound, count in self.histogram():
+            lines.append("  <= {:>7} ms: {}".format(bound, count))
+        return "\n".join(lines)
@@ -2,19 +2,32 @@
 # Filename: main.py                                                            #
 # Created by: Venceslas Duet                                                   #
 # Created at: 04-07-2018                                                       #
-# Last update at: 03-15-2022                                                   #
+# Last update at: 10-19-2026                                                   #
 # Description: Main file for the interface                                     #
 # Licence: None                                                                #
 ################################################################################
 
+import argparse
+import json
 import os
+import threading
+import time
 import pygame
+from datetime import datetime
 
 from resource import Resource
 
-from graphics import layer, background
+from graphics import layer, background, presenter, tween, postprocess
 
 import config
+import internal
+from latency import LatencyMonitor
+from recorder import FrameRecorder
+from replay import InputRecorder
+from startup import StartupTimer
+from metrics import Metrics, MetricsServer, BucketHistogram
+from controls import Action, Controls
+from journal import StateJournal
 from components import Toolbar, Clock
 
 
@@ -23,20 +36,39 @@ class Game:
     LAUNCHER_MENU = 0
     IN_GAME = 1
 
-    def __init__(self):
+    # Startup phases loaded behind the splash screen
+    LOAD_PHASES = ["resources", "components", "layout"]
+
+    # Time without resize event before the launcher is laid out again (seconds)
+    RESIZE_SETTLE = 0.15
+
+    def __init__(self, time_source=datetime.now, state_path="resource/state"):
+        self.startup = StartupTimer(Game.LOAD_PHASES)
         self.refresh = None
+        self.time_source = time_source
         self.ratio = None
         self.last_hover_element = None
 
-        # Load resources
-        Resource.load("MainPack")
-
-        # Load the launcher's configuration file
+        # Load the launcher's configuration file (it selects the presentation backend), then the
+        # setting changes journaled since it was last saved
         config.Config.load()
-
-        # Setting the icon and the title of the launcher
-        pygame.display.set_icon(Resource.getImage(Resource.MISC, Resource.MISC_ICON_32))
-        pygame.display.set_caption("pyArcade launcher")
+        # Setting changes, safe against power cuts
+        self.journal = StateJournal(state_path)
+        config.Config.attach(self.journal)
+        if config.Config.release_mode:
+            internal.set_validation(False)
+        self.startup.mark("config")
+
+        # Choosing the presentation backend
+        pygame.display.init()
+        self.presenter = presenter.create_presenter(config.Config.renderer)
+        self.post_process = None
+        if config.Config.crt_effect:
+            try:
+                self.post_process = postprocess.CRTEffect()
+            except pygame.error:
+                # NumPy is not installed, frames are shown without the effect
+                pass
 
         # Hide cursor
         # pygame.mouse.set_cursor((8, 8), (0, 0), (0, 0, 0, 0, 0, 0, 0, 0), (0, 0, 0, 0, 0, 0, 0, 0))
@@ -52,32 +84,128 @@ class Game:
             self.screen_size = (windll.user32.GetSystemMetrics(0), windll.user32.GetSystemMetrics(1))
         else:
             self.screen_size = (pygame.display.Info().current_w, pygame.display.Info().current_h)
+        self.window_size = self.screen_size
+        self.pending_size = None
+        self.resize_deadline = None
 
         # Initialize the launcher modules
         # TODO: Adapter à la borne
         self.game = None
 
-        # Initializing graphical objects
+        # Graphical objects are created by load() while the splash screen is shown
         self.window = None
-        self.draw_canvas = layer.Layer(self.minsize, 5, 0)
-        self.background = background.Background(self.minsize, Resource.getColor(Resource.COLOR_BACKGROUND))
-        self.toolbar = Toolbar()
-        self.clock = Clock()
+        self.draw_canvas = None
+        self.background = None
+        self.toolbar = None
+        self.clock = None
+        self.load_error = None
 
         # Initializing the software state variables
+        self.low_latency = config.Config.low_latency
+        self.latency = LatencyMonitor()
+        self.tweens = tween.Tweener(lambda: self.time_source().timestamp())
+        self.controls = Controls(lambda: self.time_source().timestamp())
+        self.controls.load()
+        self.focus = None
+        self.recorder = None
+        self.input_recorder = None
+        self.save_config = True
+        self.startup_report = False
+        self.latency_report = False
+        self.metrics = Metrics()
+        self.metrics_server = None
+        self.setup_metrics()
         self.run = False
         self.err = False
         self.errName = ""
+        self.startup.mark("display")
 
-        # Resizing the window
-        self.resize(self.get_size())
+    def load(self):
+        # Load resources
+        Resource.load("MainPack")
+        self.startup.mark("resources")
+
+        # Initializing graphical objects
+        self.draw_canvas = layer.Layer(self.minsize, 5, 0)
+        self.background = background.Background(self.minsize, Resource.getColor(Resource.COLOR_BACKGROUND))
+        self.toolbar = Toolbar()
+        self.clock = Clock(time_source=self.time_source)
+        self.startup.mark("components")
 
-        # Initializing layers
+        # Initializing layers (static content at the bottom so it stays in the flattened cache)
         self.background_id = self.draw_canvas.add_surface(self.background, (0, 0), 0)
-        self.toolbar_id = self.draw_canvas.add_surface(self.toolbar, (0, 0), clip=(layer.ClipPosition.LEFT, layer.ClipPosition.BOTTOM))
-        self.clock_id = self.draw_canvas.add_surface(self.clock, (0, 0), clip=(layer.ClipPosition.CENTER, layer.ClipPosition.TOP))
+        self.toolbar_id = self.draw_canvas.add_surface(self.toolbar, (0, 0), 1, clip=(layer.ClipPosition.LEFT, layer.ClipPosition.BOTTOM))
+        self.clock_id = self.draw_canvas.add_surface(self.clock, (0, 0), 2, clip=(layer.ClipPosition.CENTER, layer.ClipPosition.TOP))
 
-    def resize(self, new_size):
+        # Resizing the window
+        self.resize(self.get_size())
+        self.startup.mark("layout")
+
+    def load_safely(self):
+        try:
+            self.load()
+        except Exception as err:
+            self.load_error = err
+
+    def boot(self):
+        # Show the splash screen before anything else is loaded
+        logo = Resource.loadSplash("MainPack")
+        splash = layer.Layer(self.canvas_size(self.get_size()), 2)
+        splash.add_surface(logo, (0, 0), 0, clip=(layer.ClipPosition.CENTER, layer.ClipPosition.MIDDLE))
+        bar_id = splash.add_surface(pygame.Surface((1, 2)), (0, logo.get_height() // 2 + 6), 1,
+                                    clip=(layer.ClipPosition.CENTER, layer.ClipPosition.MIDDLE))
+        self.presenter.present(splash)
+        self.startup.mark("splash")
+
+        loader = threading.Thread(target=self.load_safely, name="loader", daemon=True)
+        loader.start()
+        while loader.is_alive():
+            pygame.event.pump()
+            bar = pygame.Surface((max(1, int(logo.get_width() * self.startup.progress())), 2))
+            bar.fill(pygame.Color(255, 255, 255))
+            splash.change_surface(bar_id, bar)
+            self.presenter.present(splash)
+            loader.join(1 / 30)
+
+        if self.load_error is not None:
+            raise self.load_error
+        self.presenter.set_icon(Resource.getImage(Resource.MISC, Resource.MISC_ICON_32))
+
+    def setup_metrics(self):
+        self.frame_time = self.metrics.histogram("pyarcade_frame_seconds", "Time spent rendering and presenting a frame",
+                                                 (0.001, 0.002, 0.004, 0.008, 0.0167, 0.0333, 0.05, 0.1, 0.25))
+        self.loop_time = self.metrics.histogram("pyarcade_loop_seconds", "Time spent in a main loop iteration, event wait excluded",
+                                                (0.001, 0.002, 0.004, 0.008, 0.0167, 0.0333, 0.05, 0.1, 0.25))
+        self.metrics.add(BucketHistogram("pyarcade_input_latency_seconds", "Input to presented frame latency",
+                                         self.latency, 0.001))
+        self.redraws = self.metrics.counter("pyarcade_redraws_total", "Presented frames")
+        self.metrics.counter("pyarcade_layer_redraws_total", "Canvas layers redrawn",
+                             lambda: sum(self.draw_canvas.layer_version) if self.draw_canvas is not None else 0)
+        self.event_depth = self.metrics.gauge("pyarcade_event_queue_depth", "Events drained by the last loop iteration")
+        self.metrics.gauge("pyarcade_surface_bytes", "Memory used by the launcher surfaces", self.surface_memory)
+        self.metrics.gauge("pyarcade_atlas_pages", "Texture atlas pages",
+                           lambda: len(Resource.atlas.pages) if Resource.atlas is not None else 0)
+        self.metrics.gauge("pyarcade_text_layout_cache_entries", "Cached text layouts",
+                           lambda: sum(len(i.layout_cache) for i in Resource.fonts))
+        self.metrics.counter("pyarcade_text_layout_cache_hits_total", "Text layout cache hits",
+                             lambda: sum(i.layout_hits for i in Resource.fonts))
+        self.metrics.counter("pyarcade_text_layout_cache_misses_total", "Text layout cache misses",
+                             lambda: sum(i.layout_misses for i in Resource.fonts))
+        self.metrics.counter("pyarcade_scaled_surface_cache_hits_total", "Scaled member surface cache hits",
+                             lambda: layer.LayerMember.scale_hits)
+        self.metrics.counter("pyarcade_scaled_surface_cache_misses_total", "Scaled member surface cache misses",
+                             lambda: layer.LayerMember.scale_misses)
+
+    def surface_memory(self):
+        surfaces = []
+        if self.draw_canvas is not None:
+            surfaces += [self.draw_canvas, self.draw_canvas.flat_cache] + list(self.draw_canvas.layer)
+            surfaces += [self.background, self.toolbar, self.toolbar.layer, self.clock, self.clock.text]
+        if Resource.atlas is not None:
+            surfaces += list(Resource.atlas.pages)
+        return sum(i.get_width() * i.get_height() * i.get_bytesize() for i in surfaces)
+
+    def canvas_size(self, new_size):
         # TODO: Avoid the vertical line at the right of the screen
         # Checking the size of the window
         if new_size[0] < self.minsize[0] or new_size[1] < self.minsize[1]:
@@ -95,94 +223,227 @@ class Game:
             size = (self.minsize[0], int(self.minsize[1] / self.ratio))
         elif self.ratio > 1:
             size = (int(self.minsize[0] * self.ratio), self.minsize[1])
+        return size
 
-        # Resize elements
-        self.background.resize(size)
-        self.toolbar.resize(size)
-        self.draw_canvas.resize(size)
+    def resize(self, new_size):
+        size = self.canvas_size(new_size)
+        # Images shown by the window follow the upscaling of the canvas to the window,
+        # True is returned when they were rasterized again and need to be passed to it
+        window_images = Resource.setScale(new_size[1] / size[1])
 
-        if self.run:
-            self.create_window()
+        # Resize elements (each of them keeps its buffers when its own size did not change)
+        self.draw_canvas.resize(size)
+        # Elements drawn again in place have their layers composed again at next refresh
+        if self.background.resize(size):
+            self.draw_canvas.change_surface(self.background_id, self.background)
+        if self.toolbar.resize(size):
+            self.draw_canvas.change_surface(self.toolbar_id, self.toolbar)
 
         os.environ["SDL_VIDEO_CENTERED"] = '1'
+        return window_images
 
     def create_window(self):
-        self.window = pygame.display.set_mode(self.get_size(),
-#                                              pygame.FULLSCREEN |
-                                              pygame.DOUBLEBUF | pygame.HWSURFACE)
+        try:
+            self.presenter.open(self.get_size(), "pyArcade launcher")
+        except pygame.error:
+            # No usable SDL renderer, keeping the software surface path
+            self.presenter = presenter.SurfacePresenter()
+            self.presenter.open(self.get_size(), "pyArcade launcher")
+        self.window = self.presenter.window
+        if isinstance(self.presenter, presenter.SurfacePresenter):
+            self.presenter.post_process = self.post_process
+        if Resource.loaded:
+            self.presenter.set_icon(Resource.getImage(Resource.MISC, Resource.MISC_ICON_32))
 
     def get_size(self):
-        return self.screen_size
+        return self.window_size
+
+    def pump_events(self):
+        self.latency.pump(pygame.event.get())
+
+    def wait_events(self, timeout):
+        self.pump_events()
+        events = self.latency.take()
+        if not events:
+            # A timeout of 0 would make pygame wait without limit
+            events = [pygame.event.wait(max(1, timeout))] + pygame.event.get()
+        return events
+
+    def hard_refresh(self):
+        self.background.change_color(Resource.getColor(Resource.COLOR_BACKGROUND))
+        self.toolbar.hard_refresh()
+        self.clock.hard_refresh()
+        # Both are updated in place, their cached layers need to be composed again
+        self.draw_canvas.change_surface(self.background_id, self.background)
+        self.draw_canvas.change_surface(self.toolbar_id, self.toolbar)
+
+        self.refresh = True
+
+    def render(self):
+        start = time.perf_counter()
+        self.refresh = False
+
+        self.clock.refresh()
+        if self.clock.pop_damage():
+            self.draw_canvas.change_surface(self.clock_id, self.clock)
+        # Inputs arriving while the frame is built are stamped before and after its presentation
+        self.pump_events()
+        self.presenter.present(self.draw_canvas)
+
+        self.latency.presented()
+        self.pump_events()
+        self.frame_time.observe(time.perf_counter() - start)
+        self.redraws.inc()
+
+        if self.recorder is not None:
+            if not self.presenter.composites_canvas:
+                self.draw_canvas.refresh()
+            self.recorder.capture(self.draw_canvas)
+
+    def toggle_recording(self):
+        if self.recorder is None:
+            path = os.path.join("records", self.time_source().strftime("%Y%m%d-%H%M%S"))
+            self.recorder = FrameRecorder(path, self.draw_canvas.get_size(), config.Config.record_format)
+        else:
+            self.recorder.close()
+            self.recorder = None
 
     def main(self):
         pygame.init()
-        pygame.key.set_repeat(400, 100)
+        self.controls.open_joysticks()
 
         self.refresh = True
-        self.run = True
         self.create_window()
+        self.startup.mark("window")
+        self.boot()
+        if config.Config.metrics_port:
+            self.metrics_server = MetricsServer(self.metrics, config.Config.metrics_port)
+            self.metrics_server.start()
+        self.run = True
         self.last_hover_element = -1
 
         step = 0
 
-        # TODO: Use a specific function managing inputs
-
         while self.run:
-            # k_up, k_down, k_right, k_left, k_enter, k_shift = False, False, False, False, False, False
-            k_esc = False
-            reload_pressed = False
             hard_refresh = False
 
-            for event in [pygame.event.wait(1000)] + pygame.event.get():
-                match event.type:
-                    case pygame.QUIT:
-                        self.run = False
-                    case pygame.KEYDOWN:
-                        match event.key:
-                            case pygame.K_ESCAPE: k_esc = True
-                            case pygame.K_r:
-                                if not reload_pressed:
-                                    reload_pressed = True
-                                    Resource.load("MainPack")
-                                    hard_refresh = True
-                    case pygame.KEYUP:
-                        match event.key:
-                            case pygame.K_r:
-                                reload_pressed = False
-
-            if k_esc:
-                self.run = False
+            timeout = min(1000, self.clock.next_update_delay())
+            if self.tweens.is_active():
+                timeout = min(timeout, self.tweens.next_delay())
+            if self.controls.next_delay() is not None:
+                timeout = min(timeout, self.controls.next_delay())
+            if self.pending_size is not None:
+                timeout = min(timeout, max(0, int((self.resize_deadline - self.time_source().timestamp()) * 1000) + 1))
+            events = self.wait_events(timeout)
+            iteration_start = time.perf_counter()
+            self.event_depth.set(len(events))
+            self.latency.stamp(events)
+            if self.input_recorder is not None:
+                self.input_recorder.record(events)
+
+            for event in events:
+                if event.type == pygame.QUIT:
+                    self.run = False
+                elif event.type in (pygame.VIDEORESIZE, pygame.WINDOWSIZECHANGED):
+                    # A burst of resize events only stretches the current canvas, the layout is done once it settles
+                    # (maximize and restore only send WINDOWSIZECHANGED on some platforms)
+                    self.pending_size = event.size if event.type == pygame.VIDEORESIZE else (event.x, event.y)
+                    self.resize_deadline = self.time_source().timestamp() + Game.RESIZE_SETTLE
+                    self.refresh = True
+
+            actions = self.controls.process(events)
+            for action in actions:
+                match action:
+                    case Action.QUIT: self.run = False
+                    case Action.RECORD: self.toggle_recording()
+                    case Action.RELOAD:
+                        Resource.load("MainPack")
+                        self.presenter.set_icon(Resource.getImage(Resource.MISC, Resource.MISC_ICON_32))
+                        hard_refresh = True
+            input_refresh = Controls.dispatch(actions, self.focus)
+
+            if (hard_refresh or input_refresh) and self.low_latency:
+                # Present input-driven changes before any other work of the iteration
+                if hard_refresh:
+                    self.hard_refresh()
+                    hard_refresh = False
+                self.render()
+            elif input_refresh:
+                self.refresh = True
 
-            if self.clock.update_hour():
+            if self.pending_size is not None and self.time_source().timestamp() >= self.resize_deadline:
+                self.window_size = self.pending_size
+                self.pending_size = None
+                if self.resize(self.window_size):
+                    self.presenter.set_icon(Resource.getImage(Resource.MISC, Resource.MISC_ICON_32))
                 self.refresh = True
 
-            if hard_refresh:
-                self.background.change_color(Resource.getColor(Resource.COLOR_BACKGROUND))
-                self.toolbar.hard_refresh()
-                self.clock.refresh()
+            if self.clock.update_hour():
+                self.refresh = True
 
+            if self.tweens.update():
                 self.refresh = True
 
-            if self.refresh or step < 2:
-                self.refresh = False
+            if hard_refresh:
+                self.hard_refresh()
 
+            if self.refresh or step < 2:
                 if step < 1:
                     step += 1
 
-                self.clock.refresh()
-                self.draw_canvas.change_surface(self.clock_id, self.clock)
-                self.draw_canvas.refresh()
-
-                to_render = pygame.transform.scale(self.draw_canvas, self.get_size())
-                self.window.blit(to_render, (0, 0))
-
-                pygame.display.flip()
-
-        config.Config.save()
+                self.render()
+                if self.startup.elapsed("first frame") is None:
+                    self.startup.mark("first frame")
+                    if self.startup_report:
+                        print(self.startup.report())
+
+            # Inputs handled without presenting a frame had no visible effect
+            self.latency.drop_pending()
+            self.loop_time.observe(time.perf_counter() - iteration_start)
+
+        if self.recorder is not None:
+            self.toggle_recording()
+        if self.input_recorder is not None:
+            self.input_recorder.close()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        if self.save_config:
+            config.Config.save()
+        config.Config.journal = None
+        self.journal.close()
+        self.presenter.close()
         pygame.quit()
+        if self.latency_report:
+            print(self.latency.report())
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="pyArcade launcher")
+    parser.add_argument("--record-input", metavar="PATH", help="record the input session for replay.py")
+    parser.add_argument("--startup-report", action="store_true", help="print the startup phase timings")
+    parser.add_argument("--latency-report", action="store_true", help="print the input latency histogram on exit")
+    parser.add_argument("--set", metavar="NAME=VALUE", action="append", default=[],
+                        help="change a setting (JSON value), kept even if the launcher is not closed cleanly; "
+                             "display settings apply at the next start")
+    args = parser.parse_args()
+
+    settings = []
+    for setting in args.set:
+        name, _, value = setting.partition("=")
+        if name not in config.Config.SETTINGS:
+            parser.error("unknown setting " + name)
+        try:
+            value = json.loads(value)
+        except ValueError:
+            pass
+        settings.append((name, value))
+
     # Start game
     game = Game()
+    for name, value in settings:
+        config.Config.set(name, value)
+    game.startup_report = args.startup_report
+    game.latency_report = args.latency_report
+    if args.record_input:
+        game.input_recorder = InputRecorder(args.record_input, game.time_source())
     game.main()
@@ -0,0 +1,175 @@
+################################################################################
+# Filename: metrics.py                                                         #
+# Created by: Venceslas Duet                                                   #
+# Created at: 10-19-2026                                                       #
+# Last update at: 10-19-2026                                                   #
+# Description: Launcher performance metrics exposed on a local HTTP endpoint   #
+# in Prometheus text format                                                    #
+# Licence: None                                                                #
+################################################################################
+
+import http.server
+import threading
+
+
+def format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return "{:.9g}".format(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """!@brief Counter incremented by the render loop, or computed by `collect` when scraped"""
+
+    def __init__(self, name, description, collect=None):
+        self.name = name
+        self.description = description
+        self.collect = collect
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def render(self):
+        value = self.collect() if self.collect is not None else self.value
+        return ["# HELP {} {}".format(self.name, self.description),
+                "# TYPE {} counter".format(self.name),
+                "{} {}".format(self.name, format_value(value))]
+
+
+class Gauge:
+    """!@brief Gauge set by the render loop, or computed by `collect` when scraped"""
+
+    def __init__(self, name, description, collect=None):
+        self.name = name
+        self.description = description
+        self.collect = collect
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def render(self):
+        value = self.collect() if self.collect is not None else self.value
+        return ["# HELP {} {}".format(self.name, self.description),
+                "# TYPE {} gauge".format(self.name),
+                "{} {}".format(self.name, format_value(value))]
+
+
+class Histogram:
+    def __init__(self, name, description, buckets):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(buckets) + (float("inf"),)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i in range(len(self.buckets)):
+            if value <= self.buckets[i]:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    def render(self):
+        return Histogram.render_buckets(self.name, self.description, self.buckets, list(self.counts),
+                                        self.sum, self.count)
+
+    @staticmethod
+    def render_buckets(name, description, buckets, counts, total, count):
+        lines = ["# HELP {} {}".format(name, description),
+                 "# TYPE {} histogram".format(name)]
+        cumulated = 0
+        for bound, bucket_count in zip(buckets, counts):
+            cumulated += bucket_count
+            lines.append('{}_bucket{{le="{}"}} {}'.format(name, format_value(bound), cumulated))
+        lines.append("{}_sum {}".format(name, format_value(total)))
+        lines.append("{}_count {}".format(name, count))
+        return lines
+
+
+class BucketHistogram:
+    """!@brief Exposes an existing bucketed histogram (counts, BUCKETS, total and count attributes)
+
+    @param scale Factor converting the source unit to the exposed one
+    """
+
+    def __init__(self, name, description, source, scale=1.0):
+        self.name = name
+        self.description = description
+        self.source = source
+        self.scale = scale
+
+    def render(self):
+        buckets = [i * self.scale for i in self.source.BUCKETS]
+        return Histogram.render_buckets(self.name, self.description, buckets, list(self.source.counts),
+                                        self.source.total * self.scale, self.source.count)
+
+
+class Metrics:
+    """!@brief Registry of the launcher metrics
+
+    Metrics are only written by the render loop and read by the scraping thread. Values are plain
+    attributes updated under the GIL, so scraping takes no lock shared with the render loop and a
+    scrape may at worst see a histogram one observation behind its count.
+    """
+
+    def __init__(self):
+        self.metrics = []
+
+    def add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, description, collect=None):
+        return self.add(Counter(name, description, collect))
+
+    def gauge(self, name, description, collect=None):
+        return self.add(Gauge(name, description, collect))
+
+    def histogram(self, name, description, buckets):
+        return self.add(Histogram(name, description, buckets))
+
+    def render(self):
+        lines = []
+        for metric in list(self.metrics):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """!@brief Serves Metrics.render() on http://host:port/metrics from a daemon thread"""
+
+    def __init__(self, metrics, port, host="127.0.0.1"):
+        registry = metrics
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = http.server.ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="metrics", daemon=True)
+
+    def get_port(self):
+        return self.server.server_address[1]
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,129 @@
+################################################################################
+# Filename: prefetch.py                                                        #
+# Created by: Venceslas Duet                                                   #
+# Created at: 10-19-2026                                                       #
+# Last update at: 10-19-2026                                                   #
+# Description: Artwork prefetching ahead of the navigation in a grid of cards  #
+# Licence: None                                                                #
+################################################################################
+
+from resource import Resource
+
+
+class ArtworkPrefetcher:
+    """!@brief Keeps the artwork around the focused card decoded, ahead of the navigation direction
+
+    Cards within `radius` of the focus are requested, plus `depth` more rows or columns in the
+    direction of the last move, nearest first and cards ahead before cards behind. Requests which
+    left that area when the direction changes are cancelled. Decoded artwork is kept up to
+    `memory_cap` bytes, the cards farthest from the focus being dropped first.
+
+    The grid element forwards its navigation events (event_left, event_right, event_top and
+    event_bottom) to the prefetcher.
+
+    @param paths Artwork file of each card, in grid order
+    @param columns Number of cards per row
+    """
+
+    def __init__(self, paths, columns, radius=2, depth=3, memory_cap=32 * 1024 * 1024):
+        if not isinstance(columns, int) or columns <= 0:
+            raise ValueError("columns needs to be a integer upper to 0")
+        self.paths = paths
+        self.columns = columns
+        self.radius = radius
+        self.depth = depth
+        self.memory_cap = memory_cap
+        self.focus = 0
+        self.direction = (0, 0)
+        self.cache = {}
+        self.failed = set()
+        self.memory = 0
+        # Cards requested by the prefetcher and their priority
+        self.wanted = {}
+
+        self.prefetch()
+
+    def position(self, index):
+        return index // self.columns, index % self.columns
+
+    def distance(self, index):
+        row, column = self.position(index)
+        focus_row, focus_column = self.position(self.focus)
+        return max(abs(row - focus_row), abs(column - focus_column))
+
+    def navigate(self, dx, dy):
+        row, column = self.position(self.focus)
+        row = min(max(row + dy, 0), (len(self.paths) - 1) // self.columns)
+        column = min(max(column + dx, 0), self.columns - 1)
+        self.focus = min(row * self.columns + column, len(self.paths) - 1)
+        self.direction = (dx, dy)
+        self.prefetch()
+
+    def event_left(self):
+        self.navigate(-1, 0)
+
+    def event_right(self):
+        self.navigate(1, 0)
+
+    def event_top(self):
+        self.navigate(0, -1)
+
+    def event_bottom(self):
+        self.navigate(0, 1)
+
+    def priorities(self):
+        if not self.paths:
+            return {}
+        row, column = self.position(self.focus)
+        dx, dy = self.direction
+        rows = range(max(0, row - self.radius - (self.depth if dy < 0 else 0)),
+                     row + self.radius + (self.depth if dy > 0 else 0) + 1)
+        columns = range(max(0, column - self.radius - (self.depth if dx < 0 else 0)),
+                        min(self.columns, column + self.radius + (self.depth if dx > 0 else 0) + 1))
+        ret = {}
+        for i in rows:
+            for j in columns:
+                index = i * self.columns + j
+                if index >= len(self.paths):
+                    break
+                distance = max(abs(i - row), abs(j - column))
+                ahead = (i - row) * dy + (j - column) * dx
+                # Cards behind the move are needed later than cards ahead at the same distance
+                ret[index] = distance if ahead >= 0 else distance + self.depth
+        return ret
+
+    def prefetch(self):
+        wanted = self.priorities()
+        for index in self.wanted:
+            if index not in wanted:
+                Resource.cancelArtwork(index)
+        for index, priority in sorted(wanted.items(), key=lambda i: i[1]):
+            if index in self.cache or index in self.failed:
+                continue
+            # Requests already sent to a worker are kept, waiting ones get their new priority
+            if not Resource.isArtworkRequested(index) or Resource.isArtworkPending(index):
+                Resource.requestArtwork(index, self.paths[index], priority)
+        self.wanted = wanted
+
+    def update(self):
+        """!@brief Stores the decoded artwork, returns the indices of the cards which got theirs"""
+        ready = []
+        for index, surface in Resource.pollArtwork():
+            if surface is None:
+                self.failed.add(index)
+                continue
+            if index in self.cache:
+                continue
+            self.cache[index] = surface
+            self.memory += surface.get_width() * surface.get_height() * surface.get_bytesize()
+            ready.append(index)
+        if self.memory > self.memory_cap:
+            for index in sorted(self.cache, key=self.distance, reverse=True):
+                if self.memory <= self.memory_cap or index == self.focus:
+                    break
+                surface = self.cache.pop(index)
+                self.memory -= surface.get_width() * surface.get_height() * surface.get_bytesize()
+        return ready
+
+    def get(self, index):
+        return self.cache.get(index)
@@ -0,0 +1,120 @@
+################################################################################
+# Filename: recorder.py                                                        #
+# Created by: Venceslas Duet                                                   #
+# Created at: 10-19-2026                                                       #
+# Last update at: 10-19-2026                                                   #
+# Description: Offscreen frame recorder encoding in a worker process           #
+# Licence: None                                                                #
+################################################################################
+
+import multiprocessing
+import os
+import queue
+import struct
+from multiprocessing import shared_memory
+
+import pygame
+
+# Header written before each frame of a raw dump: frame index, width, height, pitch and pixel layout
+RAW_HEADER = struct.Struct("<IIII4s")
+
+
+def pixel_layout(surface):
+    masks = surface.get_masks()
+    if surface.get_bytesize() != 4:
+        return None
+    if masks[:3] == (0xff0000, 0xff00, 0xff):
+        return "BGRA"
+    if masks[:3] == (0xff, 0xff00, 0xff0000):
+        return "RGBA"
+    return None
+
+
+def encode_frames(memory_name, slot_size, jobs, free, path, frame_format):
+    memory = shared_memory.SharedMemory(memory_name)
+    raw = open(os.path.join(path, "frames.raw"), "wb") if frame_format == "raw" else None
+    try:
+        while True:
+            job = jobs.get()
+            if job is None:
+                break
+            slot, index, size, pitch, layout = job
+            data = memory.buf[slot * slot_size:slot * slot_size + pitch * size[1]]
+            if raw is not None:
+                raw.write(RAW_HEADER.pack(index, size[0], size[1], pitch, layout.encode()))
+                raw.write(data)
+            else:
+                pygame.image.save(pygame.image.frombuffer(data, size, layout, pitch),
+                                  os.path.join(path, "frame_{:06}.png".format(index)))
+            del data
+            free.put(slot)
+    finally:
+        if raw is not None:
+            raw.close()
+        memory.close()
+
+
+class FrameRecorder:
+    """!@brief Captures surfaces into a shared memory ring encoded by a worker process
+
+    Capturing copies the pixels once into a free slot and never waits on the encoder: when every
+    slot is still being encoded, the frame is dropped and counted in `dropped`. Frames are numbered
+    from 0 in capture order and dropped frames keep their number, so the gaps in the file names (or
+    raw frame indices) show where frames were dropped.
+
+    @param path Directory receiving the PNG sequence or the frames.raw dump
+    @param size Largest frame size to record, bigger frames are dropped
+    @param frame_format "png" or "raw"
+    @param slots Number of frames which can wait for the encoder
+    """
+
+    def __init__(self, path, size, frame_format="png", slots=4):
+        if frame_format not in ["png", "raw"]:
+            raise ValueError("frame_format needs to be png or raw")
+        if slots <= 0:
+            raise ValueError("slots needs to be upper to 0")
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.slot_size = size[0] * size[1] * 4
+        self.memory = shared_memory.SharedMemory(create=True, size=self.slot_size * slots)
+        context = multiprocessing.get_context("spawn")
+        self.jobs = context.Queue()
+        self.free = context.Queue()
+        for i in range(slots):
+            self.free.put(i)
+        self.worker = context.Process(target=encode_frames, daemon=True,
+                                      args=(self.memory.name, self.slot_size, self.jobs, self.free,
+                                            path, frame_format))
+        self.worker.start()
+        self.index = 0
+        self.recorded = 0
+        self.dropped = 0
+
+    def capture(self, surface):
+        index = self.index
+        self.index += 1
+        layout = pixel_layout(surface)
+        size = surface.get_size()
+        pitch = surface.get_pitch()
+        if layout is None or pitch * size[1] > self.slot_size:
+            self.dropped += 1
+            return False
+        try:
+            slot = self.free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return False
+        view = surface.get_view("0")
+        self.memory.buf[slot * self.slot_size:slot * self.slot_size + view.length] = view
+        del view
+        self.jobs.put((slot, index, size, pitch, layout))
+        self.recorded += 1
+        return True
+
+    def close(self):
+        self.jobs.put(None)
+        self.worker.join()
+        self.jobs.close()
+        self.free.close()
+        self.memory.close()
+        self.memory.unlink()
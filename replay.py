@@ -0,0 +1,149 @@
+################################################################################
+# Filename: replay.py                                                          #
+# Created by: Venceslas Duet                                                   #
+# Created at: 10-19-2026                                                       #
+# Last update at: 10-19-2026                                                   #
+# Description: Deterministic input record and headless replay for performance #
+# regression runs                                                              #
+# Licence: None                                                                #
+################################################################################
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pygame
+
+
+def serialize_event(event):
+    attributes = {}
+    for key, value in event.dict.items():
+        if isinstance(value, tuple):
+            value = list(value)
+        if isinstance(value, (bool, int, float, str, list)) or value is None:
+            attributes[key] = value
+    return [event.type, attributes]
+
+
+def deserialize_event(data):
+    attributes = {}
+    for key, value in data[1].items():
+        attributes[key] = tuple(value) if isinstance(value, list) else value
+    return pygame.event.Event(data[0], attributes)
+
+
+class InputRecorder:
+    """!@brief Writes every event batch of Game.main with its time offset (one JSON line per batch)"""
+
+    def __init__(self, path, start):
+        self.file = open(path, "w")
+        self.origin = time.perf_counter()
+        self.file.write(json.dumps({"start": start.isoformat()}) + "\n")
+
+    def record(self, events):
+        batch = {"t": time.perf_counter() - self.origin, "events": [serialize_event(i) for i in events]}
+        self.file.write(json.dumps(batch) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class ReplaySession:
+    """!@brief Feeds recorded event batches back and provides the matching fake wall-clock time"""
+
+    def __init__(self, path):
+        with open(path, "r") as file:
+            lines = file.read().splitlines()
+        self.start = datetime.fromisoformat(json.loads(lines[0])["start"])
+        self.batches = [json.loads(i) for i in lines[1:] if i]
+        self.position = 0
+        self.offset = 0.0
+
+    def now(self):
+        return self.start + timedelta(seconds=self.offset)
+
+    def wait_events(self, timeout):
+        if self.position >= len(self.batches):
+            return [pygame.event.Event(pygame.QUIT)]
+        batch = self.batches[self.position]
+        self.position += 1
+        self.offset = batch["t"]
+        return [deserialize_event(i) for i in batch["events"]]
+
+
+def replay(path):
+    """!@brief Replays a recorded session as fast as possible
+
+    @return (frame timings in seconds, hash of each rendered frame)
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    import main
+    from graphics import presenter
+
+    session = ReplaySession(path)
+    # Replays never touch the settings journal of the launcher
+    state_path = tempfile.mkdtemp(prefix="replay-state-")
+    game = main.Game(session.now, state_path)
+    game.wait_events = session.wait_events
+    # Recorded batches are the only input, the SDL queue is left alone
+    game.pump_events = lambda: None
+    game.presenter = presenter.SurfacePresenter()
+    game.save_config = False
+
+    timings = []
+    hashes = []
+    render = game.render
+
+    def timed_render():
+        start = time.perf_counter()
+        render()
+        timings.append(time.perf_counter() - start)
+        view = game.draw_canvas.get_view("0")
+        hashes.append(hashlib.sha1(view).hexdigest())
+        del view
+
+    game.render = timed_render
+    try:
+        game.main()
+    finally:
+        shutil.rmtree(state_path, ignore_errors=True)
+    return timings, hashes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a session recorded with main.py --record-input")
+    parser.add_argument("session", help="recorded session")
+    parser.add_argument("--golden", metavar="PATH", help="compare frame hashes with this file")
+    parser.add_argument("--write-golden", metavar="PATH", help="write frame hashes to this file")
+    args = parser.parse_args()
+
+    timings, hashes = replay(args.session)
+
+    ordered = sorted(timings)
+    print("{} frames, mean {:.3f} ms, median {:.3f} ms, p95 {:.3f} ms, max {:.3f} ms".format(
+        len(timings), statistics.fmean(timings) * 1000, statistics.median(timings) * 1000,
+        ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, ordered[-1] * 1000))
+
+    if args.write_golden:
+        with open(args.write_golden, "w") as golden:
+            golden.write("\n".join(hashes) + "\n")
+
+    if args.golden:
+        with open(args.golden, "r") as golden:
+            expected = golden.read().split()
+        mismatches = [i for i in range(max(len(hashes), len(expected)))
+                      if i >= len(hashes) or i >= len(expected) or hashes[i] != expected[i]]
+        if mismatches:
+            print("{} frames differ from the golden images, first at frame {}".format(len(mismatches), mismatches[0]))
+            sys.exit(1)
+        print("all frames match the golden images")
@@ -2,19 +2,24 @@
 # Filename: resource.py                                                        #
 # Created by: Venceslas Duet                                                   #
 # Created at: 05-04-2018                                                       #
-# Last update at: 03-15-2022                                                   #
+# Last update at: 10-19-2026                                                   #
 # Description: High level class for manage resource                            #
 # Licence: None                                                                #
 ################################################################################
 
 # TODO: Import metrics from configuration
 
+import hashlib
+import io
 import json
+import os
+import re
 
 import pygame
-from graphics import text, frame
+from graphics import text, frame, atlas
 
 import internal
+from artwork import ArtworkLoader
 
 
 class Resource:
@@ -77,6 +82,16 @@ class Resource:
 
     loaded = False
     path = None
+    atlas = None
+
+    # Vector images rasterized at their canvas size, by SVG hash and size
+    rasters = {}
+    # Vector images shown by the window (icon), rasterized again when the window scale changes
+    scale = 1.0
+    window_images = []
+
+    # Cover art decoded by worker processes, started with startArtwork
+    artwork = None
 
     @staticmethod
     def extractColors(names, desc_info):
@@ -104,33 +119,142 @@ class Resource:
             raise ValueError("color must have 3 or 4 components (alpha is optional)")
 
     @staticmethod
-    def extractImages(path, names, desc_info):
+    def extractImages(path, names, desc_info, category=""):
         length = len(names)
         ret = [None] * length
 
         for i in range(length):
             if names[i] in desc_info:
-                ret[i] = Resource.generateImageElement(path, names[i], desc_info[names[i]])
+                if "vector" in desc_info[names[i]]:
+                    # The raster image is only a fallback, it is not packed in the atlas
+                    vector_path, size, fallback = Resource.readVector(path, names[i], desc_info[names[i]])
+                    if desc_info[names[i]].get("window", False):
+                        Resource.window_images.append((category, i, vector_path, size, fallback))
+                        size = Resource.scaledSize(size)
+                    ret[i] = Resource.rasterize(vector_path, size, fallback)
+                else:
+                    ret[i] = Resource.generateImageElement(path, names[i], desc_info[names[i]],
+                                                           Resource.getAtlasImage(category, names[i]))
             else:
                 raise ValueError("Graphical element called {} for Misc module is unavailable. Please check desc.json".format(names[i]))
 
         return ret
 
+    @staticmethod
+    def readVector(path, name, data):
+        if data.get("type") != "Image":
+            raise ValueError("For create element, 'vector' is only allowed for Image type in " + name + " element")
+        fallback = path + "/" + data["image"] if "image" in data else None
+        if "size" in data:
+            if not internal.correct_tuple(data["size"], int, 2):
+                raise ValueError("For create Image element, 'size' need to be (int width, int height) in " + name + " element")
+            size = tuple(data["size"])
+        elif fallback is not None:
+            size = Resource.loadImage(path, name, data).get_size()
+        else:
+            raise ValueError("For create Image element, 'vector' need 'size' or 'image' in " + name + " element")
+        return path + "/" + data["vector"], size, fallback
+
+    @staticmethod
+    def scaledSize(size):
+        return max(1, round(size[0] * Resource.scale)), max(1, round(size[1] * Resource.scale))
+
+    @staticmethod
+    def sizedSVG(data, size):
+        # The root element size is the rasterization size, the viewBox keeps the drawing coordinates
+        match = re.search(rb"<svg\b[^>]*>", data)
+        if match is None:
+            raise pygame.error("no svg element")
+        tag = match.group(0)
+        if b"viewBox" not in tag:
+            width = re.search(rb'\swidth="([\d.]+)', tag)
+            height = re.search(rb'\sheight="([\d.]+)', tag)
+            if width is None or height is None:
+                raise pygame.error("svg element without viewBox nor size")
+            tag = tag[:4] + b' viewBox="0 0 ' + width.group(1) + b" " + height.group(1) + b'"' + tag[4:]
+        tag = re.sub(rb'\s(width|height)="[^"]*"', b"", tag)
+        tag = tag[:4] + b' width="%d" height="%d"' % size + tag[4:]
+        return data[:match.start()] + tag + data[match.end():]
+
+    @staticmethod
+    def rasterize(path, size, fallback):
+        with open(path, "rb") as file:
+            data = file.read()
+        key = (hashlib.sha1(data).hexdigest(), size)
+        if key in Resource.rasters:
+            return Resource.rasters[key]
+
+        cache_path = "resource/cache/vector/{}-{}x{}.png".format(key[0], size[0], size[1])
+        if os.path.isfile(cache_path):
+            image = pygame.image.load(cache_path)
+        else:
+            try:
+                image = pygame.image.load(io.BytesIO(Resource.sizedSVG(data, size)), "image.svg")
+            except pygame.error:
+                # SDL_image built without SVG support, the raster image is scaled instead
+                if fallback is None:
+                    raise
+                image = pygame.transform.smoothscale(pygame.image.load(fallback), size)
+            else:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                pygame.image.save(image, cache_path + ".tmp.png")
+                os.replace(cache_path + ".tmp.png", cache_path)
+        Resource.rasters[key] = image
+        return image
+
+    @staticmethod
+    def setScale(scale):
+        """!@brief Rasterizes again the vector images shown by the window at the window scale
+        @return True when window images were rasterized again
+        """
+        if scale == Resource.scale:
+            return False
+        Resource.scale = scale
+        images = {"misc": Resource.misc_images, "ui": Resource.ui_images, "icon": Resource.icon_images}
+        for category, index, path, size, fallback in Resource.window_images:
+            images[category][index] = Resource.rasterize(path, Resource.scaledSize(size), fallback)
+        return len(Resource.window_images) > 0
+
+    @staticmethod
+    def buildAtlas(path, descriptors):
+        # Every image and font sheet is packed into a few large surfaces, the elements are built on top of them
+        sources = {}
+        for category, names in [("misc", Resource.misc_img_names), ("ui", Resource.ui_img_names),
+                                ("icon", Resource.icon_img_names)]:
+            for name in names:
+                data = descriptors[1].get(category, {}).get(name, {})
+                if "image" in data and "vector" not in data:
+                    sources[category + "/" + name] = Resource.loadImage(descriptors[0], name, data)
+        for name in Resource.font_names:
+            if name in descriptors[3] and "image" in descriptors[3][name]:
+                sources["font/" + name] = Resource.loadImage(descriptors[2], name, descriptors[3][name])
+        return atlas.Atlas.build(sources, "resource/cache/" + path + "-atlas.json")
+
+    @staticmethod
+    def getAtlasImage(category, name):
+        key = category + "/" + name
+        if Resource.atlas is not None and key in Resource.atlas:
+            return Resource.atlas.get(key)
+        return None
+
     @staticmethod
     def load(path):
         Resource.path = path
+        Resource.window_images = []
+        Resource.fonts = []
         descriptors = Resource.readFiles(path)
+        Resource.atlas = Resource.buildAtlas(path, descriptors)
         # Read descriptor for images
         if "misc" in descriptors[1] and "ui" in descriptors[1] and "icon" in descriptors[1] and "colors" in descriptors[1]:
             # Image Resource
             # Miscellaneous images
-            Resource.misc_images = Resource.extractImages(descriptors[0], Resource.misc_img_names, descriptors[1]["misc"])
+            Resource.misc_images = Resource.extractImages(descriptors[0], Resource.misc_img_names, descriptors[1]["misc"], "misc")
 
             # UI images
-            Resource.ui_images = Resource.extractImages(descriptors[0], Resource.ui_img_names, descriptors[1]["ui"])
+            Resource.ui_images = Resource.extractImages(descriptors[0], Resource.ui_img_names, descriptors[1]["ui"], "ui")
 
             # Menu images
-            Resource.icon_images = Resource.extractImages(descriptors[0], Resource.icon_img_names, descriptors[1]["icon"])
+            Resource.icon_images = Resource.extractImages(descriptors[0], Resource.icon_img_names, descriptors[1]["icon"], "icon")
 
             # Colors
             Resource.colors = Resource.extractColors(Resource.color_names, descriptors[1]["colors"])
@@ -140,12 +264,20 @@ class Resource:
         # Read descriptor for fonts
         for i in Resource.font_names:
             if i in descriptors[3]:
-                Resource.fonts.append(Resource.generateFontElement(descriptors[2], i, descriptors[3][i]))
+                Resource.fonts.append(Resource.generateFontElement(descriptors[2], i, descriptors[3][i],
+                                                                   Resource.getAtlasImage("font", i)))
             else:
                 raise ValueError("Element called " + i + " for font is unavailable. Please check font.json")
 
         Resource.loaded = True
 
+    @staticmethod
+    def loadSplash(path):
+        descriptors = Resource.readFiles(path)
+        if "misc" in descriptors[1] and "PIXEL_LOGO" in descriptors[1]["misc"]:
+            return Resource.generateImageElement(descriptors[0], "PIXEL_LOGO", descriptors[1]["misc"]["PIXEL_LOGO"])
+        raise ValueError("Graphical element called PIXEL_LOGO for Misc module is unavailable. Please check desc.json")
+
     @staticmethod
     def reload():
         Resource.loaded = False
@@ -173,17 +305,29 @@ class Resource:
                     "For create Music element, it need to have 'loop' as property in " + name + " element")
 
     @staticmethod
-    def generateFontElement(path, name, data):
+    def loadImage(path, name, data):
+        try:
+            image_path = path + "/" + data["image"]
+            return pygame.image.load(image_path)
+        except:
+            raise ValueError(
+                "For create element, 'image' need to be valid path for valid image in " + name + " element")
+
+    @staticmethod
+    def generateFontElement(path, name, data, image=None):
         if "image" in data:
-            try:
-                image_path = path + "/" + data["image"]
-                image = pygame.image.load(image_path)
-            except:
-                raise ValueError(
-                    "For create element, 'image' need to be valid path for valid image in " + name + " element")
+            if image is None:
+                image = Resource.loadImage(path, name, data)
+            proportional = False
+            if "proportional" in data:
+                if isinstance(data["proportional"], bool):
+                    proportional = data["proportional"]
+                else:
+                    raise ValueError(
+                        "For create Font element, 'proportional' need to be bool in " + name + " element")
             if "canvas" in data:
                 if internal.correct_tuple(data["canvas"], int, 2):
-                    return text.Text(image, data["canvas"])
+                    return text.Text(image, tuple(data["canvas"]), proportional)
                 else:
                     raise ValueError(
                         "For create Font element, 'canvas' need to be (int width, int height) in " + name + " element")
@@ -194,21 +338,17 @@ class Resource:
             raise ValueError("For create element, it need to have 'image' as property in " + name + " element")
 
     @staticmethod
-    def generateImageElement(path, name, data):
+    def generateImageElement(path, name, data, image=None):
         if "type" in data:
             if "image" in data:
-                try:
-                    image_path = path + "/" + data["image"]
-                    image = pygame.image.load(image_path)
-                except:
-                    raise ValueError(
-                        "For create element, 'image' need to be valid path for valid image in " + name + " element")
+                if image is None:
+                    image = Resource.loadImage(path, name, data)
                 if data["type"] == "Image":
                     return image
                 elif data["type"] == "Frame":
                     if "margin" in data:
                         if internal.correct_tuple(data["margin"], int, 4):
-                            return frame.Frame(image, data["margin"])
+                            return frame.FrameTemplate(image, data["margin"])
                         else:
                             raise ValueError(
                                 "For create Frame element, 'margin' need to be (int top, int left, int bottom, int right) in " + name + " element")
@@ -271,6 +411,50 @@ class Resource:
         else:
             raise ValueError("Resource is not initialized")
 
+    @staticmethod
+    def newFrame(cat, name, size=None):
+        # Frames are shared templates, each user renders its own instance
+        element = Resource.getImage(cat, name)
+        if isinstance(element, (frame.FrameTemplate, frame.MultiStateFrame)):
+            return element.instance(size)
+        raise ValueError("Element {} of category {} is not a Frame".format(name, cat))
+
+    @staticmethod
+    def startArtwork(bounds):
+        if Resource.artwork is None:
+            Resource.artwork = ArtworkLoader(bounds)
+
+    @staticmethod
+    def stopArtwork():
+        if Resource.artwork is not None:
+            Resource.artwork.close()
+            Resource.artwork = None
+
+    @staticmethod
+    def requestArtwork(key, path, priority=0):
+        if Resource.artwork is None:
+            raise ValueError("Artwork loader is not started")
+        Resource.artwork.request(key, path, priority=priority)
+
+    @staticmethod
+    def cancelArtwork(key):
+        if Resource.artwork is not None:
+            Resource.artwork.cancel(key)
+
+    @staticmethod
+    def isArtworkPending(key):
+        return Resource.artwork is not None and key in Resource.artwork.pending
+
+    @staticmethod
+    def isArtworkRequested(key):
+        return Resource.artwork is not None and Resource.artwork.is_requested(key)
+
+    @staticmethod
+    def pollArtwork():
+        if Resource.artwork is None:
+            return []
+        return Resource.artwork.poll()
+
     @staticmethod
     def getFont(name):
         if name in range(1):
@@ -0,0 +1,107 @@
+################################################################################
+# Filename: search.py                                                          #
+# Created by: Venceslas Duet                                                   #
+# Created at: 10-19-2026                                                       #
+# Last update at: 10-19-2026                                                   #
+# Description: Incremental n-gram index used by the type-ahead search          #
+# Licence: None                                                                #
+################################################################################
+
+
+def normalize(text):
+    return " ".join("".join(i if i.isalnum() else " " for i in text.casefold()).split())
+
+
+def grams(text, size):
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class SearchIndex:
+    """!@brief Maps every 1, 2 and 3 letter gram of the game titles and metadata to the games containing it
+
+    A query matches a game when each of its words is found in the game text. Typing more letters can
+    only remove results, so the next query is checked against the previous results only.
+    """
+
+    GRAM_SIZE = 3
+
+    def __init__(self):
+        self.titles = {}
+        self.normalized_titles = {}
+        self.texts = {}
+        self.postings = {}
+        self.last_query = None
+        self.last_results = None
+
+    def __len__(self):
+        return len(self.texts)
+
+    def __contains__(self, game_id):
+        return game_id in self.texts
+
+    def keys(self, text):
+        keys = set()
+        for size in range(1, SearchIndex.GRAM_SIZE + 1):
+            keys |= grams(text, size)
+        return keys
+
+    def add(self, game_id, title, metadata=()):
+        if not isinstance(title, str):
+            raise TypeError("title needs to be a string")
+        if game_id in self.texts:
+            self.remove(game_id)
+        text = normalize(" ".join([title] + list(metadata)))
+        self.titles[game_id] = title
+        self.normalized_titles[game_id] = normalize(title)
+        self.texts[game_id] = text
+        for key in self.keys(text):
+            self.postings.setdefault(key, set()).add(game_id)
+        self.last_query = None
+
+    def remove(self, game_id):
+        for key in self.keys(self.texts[game_id]):
+            posting = self.postings[key]
+            posting.discard(game_id)
+            if not posting:
+                del self.postings[key]
+        del self.texts[game_id]
+        del self.titles[game_id]
+        del self.normalized_titles[game_id]
+        self.last_query = None
+
+    def candidates(self, word):
+        if len(word) <= SearchIndex.GRAM_SIZE:
+            return self.postings.get(word, set())
+        postings = sorted((self.postings.get(i, set()) for i in grams(word, SearchIndex.GRAM_SIZE)), key=len)
+        return postings[0].intersection(*postings[1:])
+
+    def matches(self, game_id, words):
+        text = self.texts[game_id]
+        for i in words:
+            if i not in text:
+                return False
+        return True
+
+    def search(self, query):
+        query = normalize(query)
+        words = query.split()
+        if not words:
+            results = set(self.texts)
+        elif self.last_query and self.last_results is not None and query.startswith(self.last_query):
+            results = {i for i in self.last_results if self.matches(i, words)}
+        else:
+            words_by_size = sorted(words, key=len, reverse=True)
+            results = set(self.candidates(words_by_size[0]))
+            for word in words_by_size[1:]:
+                results &= self.candidates(word)
+            # Postings of short words are exact, only longer words may give false candidates
+            long_words = [i for i in words if len(i) > SearchIndex.GRAM_SIZE]
+            if long_words:
+                results = {i for i in results if self.matches(i, long_words)}
+        self.last_query = query
+        self.last_results = results
+        # Titles starting with the query first, then titles with a word starting with it
+        titles = self.normalized_titles
+        word_start = " " + query
+        return sorted(results, key=lambda i: (0 if titles[i].startswith(query) else 1 if word_start in titles[i] else 2,
+                                              titles[i]))
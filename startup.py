@@ -0,0 +1,48 @@
+################################################################################
+# Filename: startup.py                                                         #
+# Created by: Venceslas Duet                                                   #
+# Created at: 10-19-2026                                                       #
+# Last update at: 10-19-2026                                                   #
+# Description: Startup phase timing and loading progress                       #
+# Licence: None                                                                #
+################################################################################
+
+import threading
+import time
+
+
+class StartupTimer:
+    """!@brief Records the end of each startup phase and the loading progress
+
+    @param phases Names of the phases counted in the progress, in their loading order
+    """
+
+    def __init__(self, phases):
+        self.origin = time.perf_counter()
+        self.last = self.origin
+        self.phases = phases
+        self.marks = []
+        self.lock = threading.Lock()
+
+    def mark(self, name):
+        now = time.perf_counter()
+        with self.lock:
+            self.marks.append((name, now - self.last, now - self.origin))
+            self.last = now
+
+    def progress(self):
+        with self.lock:
+            done = len([i for i in self.marks if i[0] in self.phases])
+        return done / len(self.phases)
+
+    def elapsed(self, name):
+        for i in self.marks:
+            if i[0] == name:
+                return i[2]
+        return None
+
+    def report(self):
+        lines = ["startup phases:"]
+        for name, duration, total in self.marks:
+            lines.append("  {:<12}{:>9.1f} ms  (at {:.1f} ms)".format(name, duration * 1000, total * 1000))
+        return "\n".join(lines)